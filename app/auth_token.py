@@ -1,3 +1,8 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 import os
@@ -17,12 +22,41 @@ EXPIRY_MINUTES = int(os.getenv("JWT_EXPIRY_MINUTES", "60"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def create_access_token(data: dict) -> str:
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+# HS256 tokens are signed with hmac directly: the header never changes, so it
+# is encoded once instead of going through jose on every login. The output is
+# byte-for-byte what jwt.encode produces.
+_HS256_HEADER = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+
+def _jose_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=EXPIRY_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+
+def create_access_token(data: dict) -> str:
+    if ALGORITHM != "HS256":
+        return _jose_token(data)
+
+    claims = {**data, "exp": int(time.time()) + EXPIRY_MINUTES * 60}
+    try:
+        body = json.dumps(claims, separators=(",", ":"))
+    except TypeError:
+        # jose converts datetime claims (iat, nbf) to timestamps; plain json
+        # does not, so leave those tokens to it.
+        return _jose_token(data)
+    payload = _b64url(body.encode("utf-8"))
+    signing_input = _HS256_HEADER + b"." + payload
+    # The key is read on every call so a rotated or patched SECRET_KEY applies.
+    signature = _b64url(hmac.new(SECRET_KEY.encode("utf-8"), signing_input, hashlib.sha256).digest())
+    return (signing_input + b"." + signature).decode("ascii")
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
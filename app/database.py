@@ -11,6 +11,11 @@ from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.engine import URL
 from sqlalchemy.engine.url import make_url
 
+try:  # optional dependency; falls back to SQLAlchemy's stdlib json encoder
+    import orjson
+except Exception:  # pragma: no cover - orjson optional
+    orjson = None
+
 load_dotenv()
 
 
@@ -136,11 +141,20 @@ DATABASE_URL: str = _database_url_from_env(os.environ) or DEFAULT_SQLITE_URL
 ECHO = os.getenv("SQLALCHEMY_ECHO", "0").lower() in {"1", "true", "yes"}
 
 
+def _orjson_serializer(value) -> str:
+    # JSON columns are bound as text, so hand the driver a str, not bytes.
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def _build_engine(database_url: str) -> AsyncEngine:
+    options = {}
+    if orjson is not None:
+        options["json_serializer"] = _orjson_serializer
     return create_async_engine(
         database_url,
         echo=ECHO,
         pool_pre_ping=True,
+        **options,
     )
 
 
@@ -201,4 +215,4 @@ async def init_models() -> None:
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-        await schema_upgrades.run_post_creation_upgrades(conn)
+    await schema_upgrades.run_post_creation_upgrades_concurrently(engine)
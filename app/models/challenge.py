@@ -26,6 +26,18 @@ class DeploymentType(str, enum.Enum):
     static_attachment = "static_attachment"
 
 
+_DEPLOYMENT_BY_VALUE = {member.value: member for member in DeploymentType}
+
+
+def deployment_type_of(challenge) -> DeploymentType:
+    """Return a challenge's deployment type, treating unknown values as dynamic."""
+
+    deployment = getattr(challenge, "deployment_type", DeploymentType.dynamic_container)
+    if isinstance(deployment, DeploymentType):
+        return deployment
+    return _DEPLOYMENT_BY_VALUE.get(deployment, DeploymentType.dynamic_container)
+
+
 class Challenge(Base):
     __tablename__ = "challenges"
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -16,7 +16,13 @@ def utcnow() -> datetime:
 class ChallengeInstance(Base):
     __tablename__ = "challenge_instances"
 
-    ACTIVE_STATUSES = {"starting", "running"}
+    # Kept sorted so the rendered IN list always matches the index predicate.
+    ACTIVE_STATUSES = ("running", "starting")
+    # SQL form of ACTIVE_STATUSES, shared by the partial index and its queries.
+    ACTIVE_STATUS_PREDICATE = "status IN (%s)" % ", ".join(f"'{s}'" for s in ACTIVE_STATUSES)
+    # No longer active, but its container still has to be removed; the next
+    # cleanup sweep removes it and marks the row stopped.
+    STOPPING_STATUS = "stopping"
 
     id = Column(Integer, primary_key=True)
     challenge_id = Column(Integer, ForeignKey("challenges.id", ondelete="CASCADE"), nullable=False)
@@ -33,6 +39,45 @@ class ChallengeInstance(Base):
     challenge = relationship("Challenge", back_populates="instances")
     user = relationship("User", back_populates="challenge_instances")
 
+    __table_args__ = (
+        # "Latest active instance for (challenge, user)" lookups on launch;
+        # ids are monotonic, so the newest row is the first index entry.
+        Index(
+            "ix_challenge_instances_active_recent",
+            "challenge_id",
+            "user_id",
+            text("id DESC"),
+            postgresql_where=text(ACTIVE_STATUS_PREDICATE),
+            sqlite_where=text(ACTIVE_STATUS_PREDICATE),
+        ),
+        # Reaper scans for expired active instances, oldest first.
+        Index(
+            "ix_challenge_instances_active_expiry",
+            "expires_at",
+            postgresql_where=text(ACTIVE_STATUS_PREDICATE),
+            sqlite_where=text(ACTIVE_STATUS_PREDICATE),
+        ),
+        # At most one active instance per player and challenge; concurrent
+        # launches lose on INSERT instead of both starting containers.
+        Index(
+            "uq_challenge_instances_active_user",
+            "user_id",
+            "challenge_id",
+            unique=True,
+            postgresql_where=text(ACTIVE_STATUS_PREDICATE),
+            sqlite_where=text(ACTIVE_STATUS_PREDICATE),
+        ),
+        # Same guarantee for the shared instance of a static challenge, whose
+        # NULL user_id the index above treats as always distinct.
+        Index(
+            "uq_challenge_instances_active_shared",
+            "challenge_id",
+            unique=True,
+            postgresql_where=text(f"user_id IS NULL AND {ACTIVE_STATUS_PREDICATE}"),
+            sqlite_where=text(f"user_id IS NULL AND {ACTIVE_STATUS_PREDICATE}"),
+        ),
+    )
+
     # ------------------------------------------------------------------
     # State helpers
     # ------------------------------------------------------------------
@@ -0,0 +1,26 @@
+"""JSON response helpers for routes that return plain dictionaries."""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:  # optional dependency; falls back to the stdlib encoder
+    import orjson
+except Exception:  # pragma: no cover - orjson optional
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """Render already JSON-compatible payloads with orjson when available.
+
+    Routes with a ``response_model`` are serialised by Pydantic directly and
+    should keep the default response class. This is for the handlers that
+    build plain ``dict``/``list`` payloads and return the response themselves,
+    which also skips FastAPI's ``jsonable_encoder`` pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
@@ -28,7 +28,7 @@ async def create_category(
     db.add(category)
     await db.commit()
     await db.refresh(category)
-    return CategoryRead.model_validate(category)
+    return CategoryRead.from_orm_trusted(category)
 
 
 @router.get("", response_model=List[CategoryRead])
@@ -37,7 +37,7 @@ async def list_categories(
     _: None = Depends(require_admin),
 ) -> List[CategoryRead]:
     rows = await db.execute(select(Category).order_by(Category.name))
-    return [CategoryRead.model_validate(cat) for cat in rows.scalars().all()]
+    return [CategoryRead.from_orm_trusted(cat) for cat in rows.scalars().all()]
 
 
 @router.get("/{category_id}", response_model=CategoryRead)
@@ -49,7 +49,7 @@ async def get_category(
     category = await db.get(Category, category_id)
     if category is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Category not found")
-    return CategoryRead.model_validate(category)
+    return CategoryRead.from_orm_trusted(category)
 
 
 @router.patch("/{category_id}", response_model=CategoryRead)
@@ -74,7 +74,7 @@ async def update_category(
 
     await db.commit()
     await db.refresh(category)
-    return CategoryRead.model_validate(category)
+    return CategoryRead.from_orm_trusted(category)
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -11,7 +11,7 @@ from sqlalchemy import select, func
 from app.database import get_db
 from app.auth_token import get_current_user
 from app.models.user import User
-from app.models.challenge import Challenge, DeploymentType
+from app.models.challenge import Challenge, DeploymentType, deployment_type_of
 from app.models.hint import Hint
 from app.models.challenge_tag import ChallengeTag
 from app.models.submission import Submission  # used to count solves
@@ -19,7 +19,7 @@ from app.models.challenge_attachment import ChallengeAttachment
 from app.models.category import Category
 from app.flag_storage import hash_flag
 from app.schemas import (
-    ChallengeCreate, ChallengeUpdate, ChallengeAdmin, HintCreate, AttachmentRead
+    ChallengeCreate, ChallengeUpdate, ChallengeAdmin, HintCreate, HintRead, AttachmentRead
 )
 from app.services import get_attachment_storage
 
@@ -105,19 +105,9 @@ async def _solves_count(db: AsyncSession, challenge_id: int) -> int:
     )
     return (await db.execute(q)).scalar_one()
 
-def _deployment_value(ch: Challenge) -> DeploymentType:
-    deployment = getattr(ch, "deployment_type", DeploymentType.dynamic_container)
-    if isinstance(deployment, str):
-        try:
-            deployment = DeploymentType(deployment)
-        except ValueError:
-            deployment = DeploymentType.dynamic_container
-    return deployment
-
-
 def _to_admin_schema(ch: Challenge, solves: int) -> ChallengeAdmin:
     attachments = [
-        AttachmentRead(
+        AttachmentRead.build_trusted(
             id=a.id,
             filename=a.filename,
             content_type=a.content_type,
@@ -140,11 +130,14 @@ def _to_admin_schema(ch: Challenge, solves: int) -> ChallengeAdmin:
         is_private=bool(ch.is_private),
         visible_from=ch.visible_from,
         visible_to=ch.visible_to,
-        deployment_type=_deployment_value(ch),
+        deployment_type=deployment_type_of(ch),
         service_port=getattr(ch, "service_port", None),
         always_on=bool(getattr(ch, "always_on", False)),
         tags=ch.tag_strings,
-        hints=sorted(ch.hints or [], key=lambda h: h.order_index),
+        hints=[
+            HintRead.from_orm_trusted(h)
+            for h in sorted(ch.hints or [], key=lambda h: h.order_index)
+        ],
         attachments=attachments,
         solves_count=solves,
         flag_hash=getattr(ch, "flag", None),
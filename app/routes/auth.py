@@ -19,7 +19,7 @@ from app.schemas import (
     UserProfileUpdate,
     UserRegister,
 )
-from app.security import pwd_context
+from app.security import hash_password_async, verify_password_async
 
 router = APIRouter()
 
@@ -39,7 +39,7 @@ async def register(user: UserRegister, db: AsyncSession = Depends(get_db)):
     if len(user.password) < 8:
         raise HTTPException(status_code=400, detail="Password too short")
 
-    hashed = pwd_context.hash(user.password)
+    hashed = await hash_password_async(user.password)
     new_user = User(
         username=user.username,
         email=user.email,
@@ -64,7 +64,7 @@ async def login(
     )
     db_user = result.scalar_one_or_none()
 
-    if not db_user or not pwd_context.verify(form_data.password, db_user.password_hash):
+    if not db_user or not await verify_password_async(form_data.password, db_user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token({"user_id": db_user.id})
@@ -72,7 +72,7 @@ async def login(
 
 @router.get("/me", response_model=UserProfileRead)
 async def read_users_me(current_user: User = Depends(get_current_user)):
-    return UserProfileRead.model_validate(current_user)
+    return UserProfileRead.from_orm_trusted(current_user)
 
 
 @router.patch("/me", response_model=UserProfileRead)
@@ -100,7 +100,7 @@ async def update_profile(
     if payload.password:
         if len(payload.password) < 8:
             raise HTTPException(status_code=400, detail="Password too short")
-        current_user.password_hash = pwd_context.hash(payload.password)
+        current_user.password_hash = await hash_password_async(payload.password)
         changed = True
 
     if payload.display_name is not None:
@@ -116,7 +116,7 @@ async def update_profile(
         await db.commit()
         await db.refresh(current_user)
 
-    return UserProfileRead.model_validate(current_user)
+    return UserProfileRead.from_orm_trusted(current_user)
 
 @router.post("/make-me-admin")
 async def make_me_admin(
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth_token import get_current_user
 from app.database import get_db
-from app.models.challenge import Challenge, DeploymentType
+from app.models.challenge import Challenge, DeploymentType, deployment_type_of
 from app.models.challenge_instance import ChallengeInstance
 from app.models.user import User
 from app.schemas import ChallengeInstanceRead
@@ -53,16 +53,6 @@ async def _latest_instance(db: AsyncSession, challenge_id: int, user_id: int) ->
     return result.scalars().first()
 
 
-def _deployment_type(challenge: Challenge) -> DeploymentType:
-    deployment = getattr(challenge, "deployment_type", DeploymentType.dynamic_container)
-    if isinstance(deployment, str):
-        try:
-            deployment = DeploymentType(deployment)
-        except ValueError:
-            deployment = DeploymentType.dynamic_container
-    return deployment
-
-
 @router.post("/start", response_model=ChallengeInstanceRead)
 async def start_instance(
     challenge_id: int,
@@ -76,7 +66,7 @@ async def start_instance(
         raise HTTPException(status_code=403, detail="Challenge not available")
 
     service = get_container_service()
-    deployment = _deployment_type(challenge)
+    deployment = deployment_type_of(challenge)
     if deployment == DeploymentType.static_attachment:
         raise HTTPException(status_code=403, detail="Challenge does not expose a runtime instance")
     try:
@@ -90,7 +80,7 @@ async def start_instance(
         raise HTTPException(status_code=500, detail=f"Failed to start challenge instance: {exc}") from exc
 
     access_url = service.build_access_url(challenge=challenge, instance=instance)
-    base = ChallengeInstanceRead.model_validate(instance)
+    base = ChallengeInstanceRead.from_orm_trusted(instance)
     return base.model_copy(update={"access_url": access_url})
 
 
@@ -105,7 +95,7 @@ async def get_my_instance(
         raise HTTPException(status_code=404, detail="Challenge not available")
 
     service = get_container_service()
-    deployment = _deployment_type(challenge)
+    deployment = deployment_type_of(challenge)
     if deployment == DeploymentType.static_attachment:
         raise HTTPException(status_code=404, detail="No active instance")
 
@@ -119,7 +109,7 @@ async def get_my_instance(
         raise HTTPException(status_code=404, detail="No active instance")
 
     access_url = service.build_access_url(challenge=challenge, instance=instance)
-    base = ChallengeInstanceRead.model_validate(instance)
+    base = ChallengeInstanceRead.from_orm_trusted(instance)
     return base.model_copy(update={"access_url": access_url})
 
 
@@ -134,7 +124,7 @@ async def stop_instance(
     if not challenge:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-    deployment = _deployment_type(challenge)
+    deployment = deployment_type_of(challenge)
     if deployment == DeploymentType.static_container:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
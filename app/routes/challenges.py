@@ -2,7 +2,7 @@ import os
 from datetime import datetime, timezone
 from urllib.parse import urljoin
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth_token import get_current_user, require_admin
 from app.database import get_db
 from app.flag_storage import hash_flag
-from app.models.challenge import Challenge, DeploymentType
+from app.models.challenge import Challenge, DeploymentType, deployment_type_of
 from app.models.challenge_attachment import ChallengeAttachment
 from app.models.challenge_instance import ChallengeInstance
 from app.models.hint import Hint
@@ -18,6 +18,7 @@ from app.models.submission import Submission
 from app.models.team import Team
 from app.models.user import User
 from app.schemas import (
+    CHALLENGE_LIST_ADAPTER,
     AttachmentRead,
     ChallengeCreate,
     ChallengeInstanceRead,
@@ -54,7 +55,7 @@ async def get_current_user_optional(
 
 
 def _attachment_to_schema(challenge_id: int, attachment: ChallengeAttachment) -> AttachmentRead:
-    return AttachmentRead(
+    return AttachmentRead.build_trusted(
         id=attachment.id,
         filename=attachment.filename,
         content_type=attachment.content_type,
@@ -64,7 +65,7 @@ def _attachment_to_schema(challenge_id: int, attachment: ChallengeAttachment) ->
 
 
 def _hint_to_schema(hint: Hint) -> HintRead:
-    return HintRead(
+    return HintRead.build_trusted(
         id=getattr(hint, "id", 0),
         text=hint.text,
         penalty=hint.penalty,
@@ -86,14 +87,9 @@ def _challenge_to_public(
         instance_access_url = access_url or service.build_access_url(
             challenge=challenge, instance=instance
         )
-        base = ChallengeInstanceRead.model_validate(instance)
+        base = ChallengeInstanceRead.from_orm_trusted(instance)
         active_instance = base.model_copy(update={"access_url": instance_access_url})
-    deployment_type = getattr(challenge, "deployment_type", DeploymentType.dynamic_container)
-    if isinstance(deployment_type, str):
-        try:
-            deployment_type = DeploymentType(deployment_type)
-        except ValueError:
-            deployment_type = DeploymentType.dynamic_container
+    deployment_type = deployment_type_of(challenge)
     return ChallengePublic(
         id=challenge.id,
         title=challenge.title,
@@ -228,12 +224,7 @@ async def list_challenges(
 
     shared_instances: dict[int, ChallengeInstance] = {}
     for c in rows:
-        deployment = getattr(c, "deployment_type", DeploymentType.dynamic_container)
-        if isinstance(deployment, str):
-            try:
-                deployment = DeploymentType(deployment)
-            except ValueError:
-                deployment = DeploymentType.dynamic_container
+        deployment = deployment_type_of(c)
         if deployment == DeploymentType.static_container:
             shared = await service.get_shared_instance(db, challenge_id=c.id)
             if shared:
@@ -256,7 +247,9 @@ async def list_challenges(
         if instance is None:
             instance = shared_instances.get(getattr(c, "id", None))
         visible.append(_challenge_to_public(c, instance=instance))
-    return visible
+    # The items are already ChallengePublic instances; serialise them with the
+    # shared adapter instead of FastAPI's per-response validation pass.
+    return Response(CHALLENGE_LIST_ADAPTER.dump_json(visible), media_type="application/json")
 
 
 @router.patch("/challenges/{challenge_id}", response_model=ChallengePublic)
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/competitions", tags=["competitions"])
 async def create_competition(
     comp: CompetitionCreate, db: AsyncSession = Depends(get_db)
 ):
-    db_comp = Competition(**comp.dict())
+    db_comp = Competition(**comp.model_dump())
     db.add(db_comp)
     await db.commit()
     await db.refresh(db_comp)
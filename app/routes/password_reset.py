@@ -1,15 +1,21 @@
 # app/routes/password_reset.py
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, field_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.database import get_db
 from app.models.user import User
+from app.schemas import EmailStr
 from app.emailer import send_email
-from app.security import pwd_context
-from app.security_tokens import generate_reset_token, hash_token, constant_time_equals
+from app.security import hash_password_async
+from app.security_tokens import (
+    generate_reset_token,
+    hash_token,
+    token_digest,
+    constant_time_equals_hex,
+)
 from app.email_templates import reset_link, reset_email_html
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -53,7 +59,8 @@ async def reset_password(
     body: ResetPasswordIn,
     db: AsyncSession = Depends(get_db),
 ):
-    token_hash = hash_token(body.token)
+    digest = token_digest(body.token)
+    token_hash = digest.hex()
     now = datetime.now(timezone.utc)
 
     res = await db.execute(select(User).where(User.reset_token_hash == token_hash))
@@ -65,10 +72,10 @@ async def reset_password(
 
     if not user or not expires_at or expires_at < now:
         raise HTTPException(status_code=400, detail="Invalid or expired token.")
-    if not constant_time_equals(user.reset_token_hash, token_hash):
+    if not constant_time_equals_hex(user.reset_token_hash, digest):
         raise HTTPException(status_code=400, detail="Invalid or expired token.")
 
-    user.password_hash = pwd_context.hash(body.new_password)
+    user.password_hash = await hash_password_async(body.new_password)
     user.reset_token_hash = None
     user.reset_token_expires_at = None
     await db.commit()
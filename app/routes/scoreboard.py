@@ -9,6 +9,7 @@ from sqlalchemy import Boolean, Text, cast, desc, asc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.responses import FastJSONResponse
 from app.models.submission import Submission
 from app.models.challenge import Challenge
 from app.models.user import User
@@ -43,7 +44,7 @@ def _rank_rows(rows):
 
 
 # --------- GET /scoreboard ---------
-@router.get("")
+@router.get("", response_class=FastJSONResponse)
 async def get_scoreboard(
     db: AsyncSession = Depends(get_db),
     type: Literal["user", "team"] = Query("team", description="Aggregate by 'user' or 'team'"),
@@ -152,10 +153,12 @@ async def get_scoreboard(
     results.sort(key=lambda x: (-x["score"], x["first_solve_at"] or datetime.max.isoformat()))
     ranked = _rank_rows(results)
 
-    return {
-        "type": type,
-        "category_id": category_id,
-        "challenge_id": challenge_id,
-        "freeze_until": freeze.isoformat() if freeze else None,
-        "results": ranked,
-    }
+    return FastJSONResponse(
+        {
+            "type": type,
+            "category_id": category_id,
+            "challenge_id": challenge_id,
+            "freeze_until": freeze.isoformat() if freeze else None,
+            "results": ranked,
+        }
+    )
@@ -14,6 +14,7 @@ from app.database import get_db
 from app.auth_token import get_current_user
 from app.flag_storage import verify_flag
 from app.rate_limiter import get_submission_rate_limiter
+from app.responses import FastJSONResponse
 
 from app.models.submission import Submission
 from app.models.challenge import Challenge
@@ -198,7 +199,7 @@ async def submit_flag(
 # -------------------------------------------------------------------
 # GET /leaderboard – aggregate *awarded* scores (dynamic + penalties)
 # -------------------------------------------------------------------
-@router.get("/leaderboard/")
+@router.get("/leaderboard/", response_class=FastJSONResponse)
 async def get_leaderboard(
     db: AsyncSession = Depends(get_db),
     type: Literal["user", "team"] = "team",
@@ -297,4 +298,4 @@ async def get_leaderboard(
             first_solve = first_solve.isoformat()
         ranked.append({**r, "first_solve_at": first_solve, "rank": rank})
 
-    return {"type": type, "event_id": event_id, "results": ranked[:limit]}
+    return FastJSONResponse({"type": type, "event_id": event_id, "results": ranked[:limit]})
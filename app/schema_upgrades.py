@@ -1,13 +1,52 @@
 """Idempotent schema upgrades applied after metadata.create_all()."""
 from __future__ import annotations
 
+import asyncio
+import logging
+
 from sqlalchemy import text
 from sqlalchemy.exc import DBAPIError
-from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.models.challenge_instance import ChallengeInstance
+
+_LOGGER = logging.getLogger(__name__)
+
+# duplicate_column, duplicate_table, duplicate_object
+_DUPLICATE_OBJECT_SQLSTATES = frozenset({"42701", "42P07", "42710"})
+_ALREADY_EXISTS_PHRASES = ("duplicate column name", "already exists")
+
+
+def _is_already_exists(ddl_error: DBAPIError) -> bool:
+    """Return True when a DDL failure only reports an existing object.
+
+    Postgres drivers expose the SQLSTATE code, which is checked directly;
+    message matching is kept for drivers without one (SQLite).
+    """
 
+    orig = getattr(ddl_error, "orig", None)
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate is not None:
+        return sqlstate in _DUPLICATE_OBJECT_SQLSTATES
+    message = str(ddl_error if orig is None else orig).lower()
+    return any(phrase in message for phrase in _ALREADY_EXISTS_PHRASES)
 
-async def ensure_first_blood_column(conn: AsyncConnection) -> None:
-    if conn.dialect.name == "sqlite":
+
+# Same predicate as the model's partial indexes, so upgraded databases end up
+# with the indexes a fresh create_all() would build.
+_ACTIVE = ChallengeInstance.ACTIVE_STATUS_PREDICATE
+
+
+async def _create_index(conn: AsyncConnection, ddl: str) -> None:
+    try:
+        await conn.execute(text(ddl))
+    except DBAPIError as ddl_error:
+        if not _is_already_exists(ddl_error):
+            raise
+
+
+async def ensure_first_blood_column(conn: AsyncConnection, dialect: str) -> None:
+    if dialect == "sqlite":
         ddl = text(
             "ALTER TABLE submissions ADD COLUMN first_blood "
             "BOOLEAN NOT NULL DEFAULT 0"
@@ -21,21 +60,13 @@ async def ensure_first_blood_column(conn: AsyncConnection) -> None:
     try:
         await conn.execute(ddl)
     except DBAPIError as ddl_error:  # column may already exist
-        message = str(getattr(ddl_error, "orig", ddl_error)).lower()
-        if not any(
-            phrase in message
-            for phrase in (
-                "duplicate column name",
-                "already exists",
-                'column "first_blood" of relation "submissions" already exists',
-            )
-        ):
+        if not _is_already_exists(ddl_error):
             raise
 
 
-async def ensure_user_profile_columns(conn: AsyncConnection) -> None:
+async def ensure_user_profile_columns(conn: AsyncConnection, dialect: str) -> None:
     statements: list[str] = []
-    if conn.dialect.name == "sqlite":
+    if dialect == "sqlite":
         statements.append("ALTER TABLE users ADD COLUMN display_name TEXT")
         statements.append("ALTER TABLE users ADD COLUMN bio TEXT")
     else:
@@ -48,21 +79,12 @@ async def ensure_user_profile_columns(conn: AsyncConnection) -> None:
         try:
             await conn.execute(text(ddl))
         except DBAPIError as ddl_error:
-            message = str(getattr(ddl_error, "orig", ddl_error)).lower()
-            if not any(
-                phrase in message
-                for phrase in (
-                    "duplicate column name",
-                    "already exists",
-                    'column "display_name" of relation "users" already exists',
-                    'column "bio" of relation "users" already exists',
-                )
-            ):
+            if not _is_already_exists(ddl_error):
                 raise
 
 
-async def ensure_hint_order_index_column(conn: AsyncConnection) -> None:
-    if conn.dialect.name == "sqlite":
+async def ensure_hint_order_index_column(conn: AsyncConnection, dialect: str) -> None:
+    if dialect == "sqlite":
         ddl = "ALTER TABLE hints ADD COLUMN order_index INTEGER NOT NULL DEFAULT 0"
     else:
         ddl = (
@@ -73,21 +95,13 @@ async def ensure_hint_order_index_column(conn: AsyncConnection) -> None:
     try:
         await conn.execute(text(ddl))
     except DBAPIError as ddl_error:
-        message = str(getattr(ddl_error, "orig", ddl_error)).lower()
-        if not any(
-            phrase in message
-            for phrase in (
-                "duplicate column name",
-                "already exists",
-                'column "order_index" of relation "hints" already exists',
-            )
-        ):
+        if not _is_already_exists(ddl_error):
             raise
 
 
-async def ensure_challenge_deployment_columns(conn: AsyncConnection) -> None:
+async def ensure_challenge_deployment_columns(conn: AsyncConnection, dialect: str) -> None:
     statements: list[str] = []
-    if conn.dialect.name == "sqlite":
+    if dialect == "sqlite":
         statements.append(
             "ALTER TABLE challenges ADD COLUMN deployment_type TEXT DEFAULT 'dynamic_container'"
         )
@@ -110,17 +124,7 @@ async def ensure_challenge_deployment_columns(conn: AsyncConnection) -> None:
         try:
             await conn.execute(text(ddl))
         except DBAPIError as ddl_error:
-            message = str(getattr(ddl_error, "orig", ddl_error)).lower()
-            if not any(
-                phrase in message
-                for phrase in (
-                    "duplicate column name",
-                    "already exists",
-                    'column "deployment_type" of relation "challenges" already exists',
-                    'column "service_port" of relation "challenges" already exists',
-                    'column "always_on" of relation "challenges" already exists',
-                )
-            ):
+            if not _is_already_exists(ddl_error):
                 raise
 
     await conn.execute(
@@ -131,8 +135,8 @@ async def ensure_challenge_deployment_columns(conn: AsyncConnection) -> None:
     )
 
 
-async def ensure_instance_user_nullable(conn: AsyncConnection) -> None:
-    if conn.dialect.name == "sqlite":
+async def ensure_instance_user_nullable(conn: AsyncConnection, dialect: str) -> None:
+    if dialect == "sqlite":
         result = await conn.exec_driver_sql("PRAGMA table_info('challenge_instances')")
         columns = result.mappings().all()
         if not columns:
@@ -210,6 +214,81 @@ async def ensure_instance_user_nullable(conn: AsyncConnection) -> None:
         raise
 
 
+async def ensure_instance_active_index(conn: AsyncConnection, dialect: str) -> None:
+    # Must run after ensure_instance_user_nullable: the SQLite rebuild there
+    # drops every index on challenge_instances.
+    await _create_index(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_challenge_instances_active_recent "
+        f"ON challenge_instances (challenge_id, user_id, id DESC) WHERE {_ACTIVE}",
+    )
+
+
+async def _retire_duplicate_instances(conn: AsyncConnection, condition: str) -> None:
+    """Move the active rows matching ``condition`` out of the active set.
+
+    Their containers are still running, so the rows become 'stopping' rather
+    than 'stopped': the next cleanup sweep removes those containers.
+    """
+
+    result = await conn.execute(
+        text(f"SELECT container_id FROM challenge_instances WHERE {condition}")
+    )
+    container_ids = [row[0] for row in result if row[0]]
+    if container_ids:
+        _LOGGER.warning(
+            "Retiring %d duplicate active challenge instances; containers queued for removal: %s",
+            len(container_ids),
+            ", ".join(container_ids),
+        )
+    await conn.execute(
+        text(f"UPDATE challenge_instances SET status = 'stopping' WHERE {condition}")
+    )
+
+
+async def ensure_instance_active_unique_index(conn: AsyncConnection, dialect: str) -> None:
+    # Older releases could race two launches into duplicate active rows; keep
+    # the newest per (user, challenge) so the unique index can be built.
+    await _retire_duplicate_instances(
+        conn,
+        f"user_id IS NOT NULL AND {_ACTIVE} "
+        "AND id NOT IN ("
+        "SELECT MAX(id) FROM challenge_instances "
+        f"WHERE user_id IS NOT NULL AND {_ACTIVE} "
+        "GROUP BY user_id, challenge_id)",
+    )
+    await _create_index(
+        conn,
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_challenge_instances_active_user "
+        f"ON challenge_instances (user_id, challenge_id) WHERE {_ACTIVE}",
+    )
+
+
+async def ensure_instance_shared_unique_index(conn: AsyncConnection, dialect: str) -> None:
+    # As above, for the per-challenge shared instances of static challenges.
+    await _retire_duplicate_instances(
+        conn,
+        f"user_id IS NULL AND {_ACTIVE} "
+        "AND id NOT IN ("
+        "SELECT MAX(id) FROM challenge_instances "
+        f"WHERE user_id IS NULL AND {_ACTIVE} "
+        "GROUP BY challenge_id)",
+    )
+    await _create_index(
+        conn,
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_challenge_instances_active_shared "
+        f"ON challenge_instances (challenge_id) WHERE user_id IS NULL AND {_ACTIVE}",
+    )
+
+
+async def ensure_instance_expiry_index(conn: AsyncConnection, dialect: str) -> None:
+    await _create_index(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_challenge_instances_active_expiry "
+        f"ON challenge_instances (expires_at) WHERE {_ACTIVE}",
+    )
+
+
 def upgrade_order() -> tuple:
     return (
         ensure_first_blood_column,
@@ -217,9 +296,42 @@ def upgrade_order() -> tuple:
         ensure_hint_order_index_column,
         ensure_challenge_deployment_columns,
         ensure_instance_user_nullable,
+        ensure_instance_active_index,
+        ensure_instance_active_unique_index,
+        ensure_instance_shared_unique_index,
+        ensure_instance_expiry_index,
     )
 
 
+# The leading steps touch disjoint tables and may run side by side; every
+# step after them depends on their results and runs sequentially.
+_INDEPENDENT_STEPS = 4
+
+
 async def run_post_creation_upgrades(conn: AsyncConnection) -> None:
+    dialect = conn.dialect.name
     for step in upgrade_order():
-        await step(conn)
+        await step(conn, dialect)
+
+
+async def run_post_creation_upgrades_concurrently(engine: AsyncEngine) -> None:
+    """Apply the upgrades, fanning the independent steps out over the pool.
+
+    SQLite serialises writers on a single file lock, so it keeps the
+    sequential single-connection path.
+    """
+
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        async with engine.begin() as conn:
+            await run_post_creation_upgrades(conn)
+        return
+
+    async def _run(step) -> None:
+        async with engine.begin() as conn:
+            await step(conn, dialect)
+
+    steps = upgrade_order()
+    await asyncio.gather(*(_run(step) for step in steps[:_INDEPENDENT_STEPS]))
+    for step in steps[_INDEPENDENT_STEPS:]:
+        await _run(step)
@@ -3,16 +3,108 @@
 # Pydantic v2 schemas, organized by domain
 # ------------------------------------------------------------
 from datetime import datetime
+import os
 import re
-from typing import Optional, List, Sequence
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Annotated, Any, Optional, List, Sequence, get_args, get_origin
 
-from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter, WithJsonSchema, field_validator
+from pydantic.networks import validate_email as _validate_email
 
 from app.models.challenge import DeploymentType
 
 
 _CONTROL_CHAR_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
 _SCRIPT_TAG_RE = re.compile(r"<\s*/?\s*script", re.IGNORECASE)
+_LINE_BREAK_RE = re.compile(r"[\r\n]")
+
+# Shared by every response model that is built from ORM rows. Extra row
+# attributes are ignored without being scanned into the model, and instances
+# are immutable so no assignment validation is wired up. Validators are built
+# on first use (or by ``build_read_models`` at startup), not at import.
+_READ_MODEL_CONFIG = ConfigDict(
+    from_attributes=True,
+    frozen=True,
+    extra="ignore",
+    validate_assignment=False,
+    defer_build=True,
+)
+
+# Rows are validated on the way in, so reads may skip re-validation.
+TRUSTED_DB = os.getenv("TRUSTED_DB", "0").lower() in {"1", "true", "yes"}
+_MISSING = object()
+
+
+def _normalize_email(value: str) -> str:
+    return _validate_email(value)[1]
+
+
+if TYPE_CHECKING:
+    from pydantic import EmailStr
+else:
+    # Same validation as pydantic's EmailStr, but email-validator is imported
+    # on the first address checked instead of while the models are built.
+    EmailStr = Annotated[
+        str,
+        AfterValidator(_normalize_email),
+        WithJsonSchema({"type": "string", "format": "email"}),
+    ]
+
+
+def _trusted_value(annotation: Any, value: Any) -> Any:
+    """Build nested read models (``X``, ``Optional[X]``, ``List[X]``) unvalidated."""
+
+    if value is None:
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, OrmReadModel):
+        return annotation._construct_from(value)
+    origin = get_origin(annotation)
+    if origin is None:
+        return value
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if origin in (list, List) and args:
+        return [_trusted_value(args[0], item) for item in value]
+    if len(args) == 1:
+        return _trusted_value(args[0], value)
+    return value
+
+
+class OrmReadModel(BaseModel):
+    """Base for response models that can skip validation for database rows."""
+
+    model_config = _READ_MODEL_CONFIG
+
+    @classmethod
+    def from_orm_trusted(cls, obj: Any):
+        """Build from an ORM row, using ``model_construct`` when ``TRUSTED_DB`` is on."""
+
+        if not TRUSTED_DB:
+            return cls.model_validate(obj)
+        return cls._construct_from(obj)
+
+    @classmethod
+    def build_trusted(cls, **values: Any):
+        """Build from values read out of the database, see ``from_orm_trusted``."""
+
+        if not TRUSTED_DB:
+            return cls(**values)
+        return cls.model_construct(**values)
+
+    @classmethod
+    def _construct_from(cls, obj: Any):
+        if isinstance(obj, cls):
+            return obj
+        values = {}
+        # JSON columns come back as plain dicts rather than ORM objects.
+        is_mapping = isinstance(obj, Mapping)
+        for name, field in cls.model_fields.items():
+            value = obj.get(name, _MISSING) if is_mapping else getattr(obj, name, _MISSING)
+            if value is not _MISSING:
+                values[name] = _trusted_value(field.annotation, value)
+        if is_mapping and cls.model_config.get("extra") == "allow":
+            for name, value in obj.items():
+                values.setdefault(name, value)
+        return cls.model_construct(**values)
 
 
 def _sanitize_single_line_text(value: str | None, *, allow_empty: bool = False) -> str | None:
@@ -23,7 +115,7 @@ def _sanitize_single_line_text(value: str | None, *, allow_empty: bool = False)
     cleaned = _CONTROL_CHAR_RE.sub("", value).strip()
     if not allow_empty and not cleaned:
         raise ValueError("Value cannot be empty")
-    if any(ch in {"\n", "\r"} for ch in cleaned):
+    if _LINE_BREAK_RE.search(cleaned):
         raise ValueError("Value must be a single line of text")
     if "<" in cleaned or ">" in cleaned:
         raise ValueError("HTML tags are not allowed in this field")
@@ -78,9 +170,7 @@ class UserLogin(BaseModel):
     password: str
 
 
-class UserProfile(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class UserProfile(OrmReadModel):
     id: int
     username: str
     email: str
@@ -102,7 +192,7 @@ class UserProfileUpdate(BaseModel):
     @field_validator("username", mode="before")
     @classmethod
     def _clean_optional_username(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_single_line_text(value) if value is not None else value
+        return _sanitize_single_line_text(value)
 
     @field_validator("password", mode="before")
     @classmethod
@@ -117,12 +207,12 @@ class UserProfileUpdate(BaseModel):
     @field_validator("display_name", mode="before")
     @classmethod
     def _clean_display_name(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_single_line_text(value) if value is not None else value
+        return _sanitize_single_line_text(value)
 
     @field_validator("bio", mode="before")
     @classmethod
     def _clean_bio(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_multiline_text(value, allow_empty=True) if value is not None else value
+        return _sanitize_multiline_text(value, allow_empty=True)
 
 
 class AdminBootstrapRequest(BaseModel):
@@ -147,9 +237,7 @@ class TeamCreate(BaseModel):
         return _sanitize_single_line_text(value)
 
 
-class TeamReadPublic(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class TeamReadPublic(OrmReadModel):
     id: int
     # raw DB name (not shown to users directly)
     team_name: str
@@ -164,9 +252,7 @@ class TeamReadPublic(BaseModel):
         return f"Deleted Team #{self.id}" if self.is_deleted else (self.team_name or "Unnamed Team")
 
 
-class TeamReadAdmin(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class TeamReadAdmin(OrmReadModel):
     id: int
     team_name: str
     created_by: int
@@ -194,18 +280,14 @@ class HintCreate(BaseModel):
         return _sanitize_multiline_text(value)
 
 
-class HintRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class HintRead(OrmReadModel):
     id: int
     text: str
     penalty: int
     order_index: int
 
 
-class AttachmentRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class AttachmentRead(OrmReadModel):
     id: int
     filename: str
     content_type: Optional[str] = None
@@ -213,13 +295,31 @@ class AttachmentRead(BaseModel):
     filesize: Optional[int] = None
 
 
-class ChallengeInstanceRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+class PortBinding(OrmReadModel):
+    # connection_info is free-form JSON (older rows carry ``port``); typing it
+    # must not drop keys from API responses.
+    model_config = ConfigDict(extra="allow")
+
+    container_port: Optional[str] = None
+    host: Optional[str] = None
+    host_port: Optional[int | str] = None
+
+
+class ConnectionInfo(OrmReadModel):
+    """Shape of ``ChallengeInstance.connection_info`` as written by the runner."""
+    model_config = ConfigDict(extra="allow")
+
+    host: Optional[str] = None
+    ports: List[PortBinding] = Field(default_factory=list)
+    path: Optional[str] = None
+    network: Optional[str] = None
 
+
+class ChallengeInstanceRead(OrmReadModel):
     id: int
     status: str
     container_id: Optional[str] = None
-    connection_info: Optional[dict] = None
+    connection_info: Optional[ConnectionInfo] = None
     started_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None
     error_message: Optional[str] = None
@@ -239,7 +339,7 @@ class CategoryBase(BaseModel):
     @field_validator("description", mode="before")
     @classmethod
     def _clean_description(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_multiline_text(value, allow_empty=True) if value is not None else value
+        return _sanitize_multiline_text(value, allow_empty=True)
 
 
 class CategoryCreate(CategoryBase):
@@ -251,9 +351,7 @@ class CategoryUpdate(BaseModel):
     description: Optional[str] = None
 
 
-class CategoryRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class CategoryRead(OrmReadModel):
     id: int
     name: str
     description: Optional[str] = None
@@ -283,7 +381,7 @@ class ChallengeBase(BaseModel):
     @field_validator("title", "difficulty", "docker_image", mode="before")
     @classmethod
     def _clean_single_line_fields(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_single_line_text(value) if value is not None else value
+        return _sanitize_single_line_text(value)
 
     @field_validator("description", mode="before")
     @classmethod
@@ -337,17 +435,17 @@ class ChallengeUpdate(BaseModel):
     @field_validator("title", "difficulty", "docker_image", mode="before")
     @classmethod
     def _clean_optional_single_line_fields(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_single_line_text(value) if value is not None else value
+        return _sanitize_single_line_text(value)
 
     @field_validator("description", mode="before")
     @classmethod
     def _clean_optional_description(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_multiline_text(value) if value is not None else value
+        return _sanitize_multiline_text(value)
 
     @field_validator("flag", mode="before")
     @classmethod
     def _clean_flag(cls, value: Optional[str]) -> Optional[str]:
-        return _sanitize_single_line_text(value) if value is not None else value
+        return _sanitize_single_line_text(value)
 
     @field_validator("tags", mode="before")
     @classmethod
@@ -356,9 +454,7 @@ class ChallengeUpdate(BaseModel):
 
 
 # ---- Public/Admin read models (no flag exposure) ----
-class ChallengePublic(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class ChallengePublic(OrmReadModel):
     id: int
     title: str
     description: str
@@ -381,13 +477,11 @@ class ChallengePublic(BaseModel):
     attachments: List[AttachmentRead] = Field(default_factory=list)
     active_instance: Optional[ChallengeInstanceRead] = None
     access_url: Optional[str] = None
-    solves_count: int = 0
     solves_count: int = 0  # fill in route from related table
 
 
-class ChallengeAdmin(BaseModel):
+class ChallengeAdmin(OrmReadModel):
     """Admin-facing challenge details, including the stored flag hash."""
-    model_config = ConfigDict(from_attributes=True)
 
     id: int
     title: str
@@ -430,9 +524,7 @@ class FlagSubmission(BaseModel):
         return _sanitize_single_line_text(value)
 
 
-class SubmissionRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class SubmissionRead(OrmReadModel):
     id: int
     user_id: int
     challenge_id: int
@@ -441,7 +533,15 @@ class SubmissionRead(BaseModel):
     submitted_at: datetime
     first_blood: bool | None = None
     points_awarded: int | None = None
-    used_hint_ids: str | None = None  
+    used_hint_ids: Optional[List[int]] = None
+
+    @field_validator("used_hint_ids", mode="before")
+    @classmethod
+    def _split_hint_ids(cls, value):
+        # Stored as comma-separated text, e.g. "1,2,5".
+        if isinstance(value, str):
+            return [int(part) for part in value.split(",") if part.strip()]
+        return value
 
 
 class SubmissionResult(BaseModel):
@@ -458,15 +558,11 @@ class CompetitionCreate(BaseModel):
     name: str
 
 
-class CompetitionOut(CompetitionCreate):
-    model_config = ConfigDict(from_attributes=True)
-
+class CompetitionOut(CompetitionCreate, OrmReadModel):
     id: int
 
 # --- Achievements ---
-class AchievementRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class AchievementRead(OrmReadModel):
     id: int
     user_id: int
     type: str
@@ -476,3 +572,17 @@ class AchievementRead(BaseModel):
     points_at_award: int | None = None
     awarded_at: datetime
 
+
+# Serializer for the challenge listing, built once instead of per response.
+CHALLENGE_LIST_ADAPTER = TypeAdapter(list[ChallengePublic], config=ConfigDict(defer_build=True))
+
+
+def build_read_models() -> None:
+    """Build every deferred read-model validator once, ahead of traffic."""
+
+    pending = list(OrmReadModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        model.model_rebuild()
+    CHALLENGE_LIST_ADAPTER.rebuild()
@@ -1,14 +1,39 @@
+import asyncio
+
 from passlib.context import CryptContext
 
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# OWASP-recommended Argon2id floor (19 MiB, 2 passes, 1 lane). Hashes created
+# with the previous passlib defaults still verify.
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+
+_hash = pwd_context.hash
+_verify = pwd_context.verify
 
 
 def hash_password(password: str) -> str:
     """Hash a plaintext password using the shared CryptContext."""
-    return pwd_context.hash(password)
+    return _hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify that ``plain_password`` matches ``hashed_password``."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _verify(plain_password, hashed_password)
+
+
+# Argon2 is CPU-bound by design and argon2-cffi releases the GIL while it
+# runs, so request handlers hash on a worker thread instead of the event loop.
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` run in a worker thread."""
+    return await asyncio.to_thread(_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` run in a worker thread."""
+    return await asyncio.to_thread(_verify, plain_password, hashed_password)
@@ -1,14 +1,33 @@
-import base64, secrets, hashlib, hmac
+import base64
+import hashlib
+import hmac
+import secrets
 
 def generate_reset_token(nbytes: int = 32) -> str:
     # URL-safe, no padding, human-pasteable
     token = base64.urlsafe_b64encode(secrets.token_bytes(nbytes)).rstrip(b'=')
     return token.decode('ascii')
 
+def generate_reset_tokens(n: int, nbytes: int = 32) -> list[str]:
+    # One CSPRNG draw for the whole batch, sliced into independent tokens.
+    raw = secrets.token_bytes(n * nbytes)
+    return [
+        base64.urlsafe_b64encode(raw[i:i + nbytes]).rstrip(b'=').decode('ascii')
+        for i in range(0, n * nbytes, nbytes)
+    ]
+
+def token_digest(token: str) -> bytes:
+    # Raw SHA-256 digest. Tokens we issue are ASCII, but this also hashes
+    # user-submitted values, so keep UTF-8 rather than failing on other text.
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
 def hash_token(token: str) -> str:
-    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    return token_digest(token).hex()
 
-def constant_time_equals(a: str | None, b: str | None) -> bool:
-    a = a or ""
-    b = b or ""
-    return hmac.compare_digest(a, b)
\ No newline at end of file
+def constant_time_equals_hex(stored_hex: str | None, digest: bytes) -> bool:
+    # Stored hashes are hex; decode once and compare the raw 32-byte digests.
+    try:
+        stored = bytes.fromhex(stored_hex)
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(stored, digest)
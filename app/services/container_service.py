@@ -1,33 +1,203 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import functools
+import heapq
+import itertools
 import logging
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
-from urllib.parse import urljoin, urlparse, urlunparse
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional
+from urllib.parse import urlparse
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.challenge import Challenge, DeploymentType
+from app.models.challenge import Challenge, DeploymentType, deployment_type_of
 from app.models.challenge_instance import ChallengeInstance
 from app.models.user import User
 
 try:  # pragma: no cover - docker is optional in some test environments
     import docker
-    from docker.errors import DockerException
+    from docker.errors import DockerException, NotFound
 except Exception:  # pragma: no cover - fallback when docker isn't installed
     docker = None
 
     class DockerException(Exception):
         pass
 
+    class NotFound(DockerException):
+        pass
+
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bind addresses that cannot be handed to players as an access host.
+_UNROUTABLE_HOSTS = frozenset({"0.0.0.0", ""})
+
+# Port number with an optional "/proto" suffix, e.g. "8000" or "8000/tcp".
+_PORT_RE = re.compile(r"\s*\+?(\d+)\s*(?:/|$)")
+
+# Container name suffixes. Seeded from the wall clock at import so a restarted
+# process never reuses a previous run's suffix; each launch then just takes
+# the next value instead of reading the clock.
+_NAME_SUFFIXES = itertools.count(time.time_ns())
+
+# Expired rows marked stopped per reaper transaction.
+_REAP_BATCH_SIZE = 500
+
+# Entries kept by the active-instance id cache before it is reset.
+_ACTIVE_CACHE_SIZE = 4096
+
+# Seconds a failed network lookup is remembered before probing again.
+_NETWORK_MISS_TTL = 30.0
+
+# Seconds an image's exposed port is trusted before re-inspecting, so a
+# re-pushed tag with a different EXPOSE is picked up.
+_IMAGE_PORT_TTL = 300.0
+
+# Distinct (visible_from, visible_to) pairs kept by the launch window cache.
+_WINDOW_CACHE_SIZE = 1024
+
+# Rendered as literals so the planner can match the partial index predicate;
+# a bound parameter list hides the values from generic prepared plans.
+_ACTIVE_STATUS_FILTER = ChallengeInstance.status.in_(
+    bindparam(
+        "active_statuses",
+        ChallengeInstance.ACTIVE_STATUSES,
+        expanding=True,
+        literal_execute=True,
+    )
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _Config:
+    """Runner settings resolved from the environment once at import."""
+
+    ttl_seconds: int
+    # Expiries are scheduled individually; this is only the fallback sweep
+    # that catches instances started before a restart or by another worker.
+    cleanup_interval: int
+    base_url: str
+    url_prefix: str
+    base_scheme: str
+    base_host: Optional[str]
+    base_port: Optional[int]
+    preferred_networks: tuple[str, ...]
+    docker_workers: int
+    # Keep-alive connections the Docker client holds open; matched to the
+    # worker threads by default so concurrent calls do not discard sockets.
+    docker_pool_size: int
+    # Upper bound on Docker removals issued at once by the reaper.
+    reap_concurrency: int
+    # Seconds a player-stopped container gets to exit before it is killed;
+    # expired containers are always force-removed.
+    stop_grace_seconds: int
+    runner: str
+    # remote-docker connection settings.
+    docker_host: Optional[str]
+    tls_verify: bool
+    tls_ca_cert: Optional[str]
+    tls_cert: Optional[str]
+    tls_key: Optional[str]
+
+
+def _base_url_settings(raw: str) -> dict[str, Any]:
+    configured = raw.strip()
+    base_url = configured.rstrip("/")
+    parsed = urlparse(configured) if configured else None
+    return {
+        "base_url": base_url,
+        "url_prefix": f"{base_url}/" if base_url else "",
+        "base_scheme": parsed.scheme if parsed and parsed.scheme else "http",
+        "base_host": parsed.hostname if parsed else None,
+        "base_port": parsed.port if parsed else None,
+    }
+
+
+def _config_from_env(env: Mapping[str, str]) -> _Config:
+    preferred = env.get("CHALLENGE_CONTAINER_NETWORK")
+    networks = [preferred] if preferred else []
+    if "ctf_net" not in networks:
+        networks.append("ctf_net")
+    workers = int(env.get("CHALLENGE_DOCKER_WORKERS", "16"))
+    return _Config(
+        ttl_seconds=int(env.get("CHALLENGE_INSTANCE_TIMEOUT", "3600")),
+        cleanup_interval=int(env.get("CHALLENGE_INSTANCE_CLEANUP_INTERVAL", "60")),
+        preferred_networks=tuple(networks),
+        docker_workers=workers,
+        docker_pool_size=max(1, int(env.get("CHALLENGE_DOCKER_POOL_SIZE", workers))),
+        reap_concurrency=max(1, int(env.get("CHALLENGE_REAP_CONCURRENCY", "8"))),
+        stop_grace_seconds=max(0, int(env.get("CHALLENGE_STOP_GRACE_SECONDS", "5"))),
+        runner=env.get("CHALLENGE_RUNNER", "local").strip().lower() or "local",
+        docker_host=env.get("CHALLENGE_DOCKER_HOST") or None,
+        tls_verify=env.get("CHALLENGE_DOCKER_TLS_VERIFY", "1").strip().lower()
+        in {"1", "true", "yes", "on"},
+        tls_ca_cert=env.get("CHALLENGE_DOCKER_TLS_CA_CERT") or None,
+        tls_cert=env.get("CHALLENGE_DOCKER_TLS_CERT") or None,
+        tls_key=env.get("CHALLENGE_DOCKER_TLS_KEY") or None,
+        **_base_url_settings(env.get("CHALLENGE_ACCESS_BASE_URL", "")),
+    )
+
+
+_CONFIG = _config_from_env(os.environ)
+
+# Expired rows are left for the reaper; lookups simply skip them.
+_UNEXPIRED_FILTER = or_(
+    ChallengeInstance.expires_at.is_(None),
+    ChallengeInstance.expires_at > bindparam("now"),
+)
+
+# Built once and reused with bound parameters, so launch-path lookups skip
+# statement construction and cache-key generation.
+_LATEST_ACTIVE_STMT = (
+    select(ChallengeInstance)
+    .where(
+        ChallengeInstance.challenge_id == bindparam("challenge_id"),
+        ChallengeInstance.user_id == bindparam("user_id"),
+        _ACTIVE_STATUS_FILTER,
+        _UNEXPIRED_FILTER,
+    )
+    .order_by(ChallengeInstance.id.desc())
+    .limit(1)
+)
+
+# Rows retired by a schema upgrade without removing their container; every
+# cleanup sweep finishes the job.
+_DRAIN_STOPPING_STMT = (
+    update(ChallengeInstance)
+    .where(ChallengeInstance.status == ChallengeInstance.STOPPING_STATUS)
+    .values(status="stopped")
+    .returning(ChallengeInstance.container_id)
+    .execution_options(synchronize_session=False)
+)
+
+# Every pending expiry, read once at startup to seed the scheduler heap;
+# served by the partial expiry index.
+_PENDING_EXPIRIES_STMT = select(ChallengeInstance.expires_at, ChallengeInstance.id).where(
+    _ACTIVE_STATUS_FILTER,
+    ChallengeInstance.expires_at.isnot(None),
+)
+
+_SHARED_ACTIVE_STMT = (
+    select(ChallengeInstance)
+    .where(
+        ChallengeInstance.challenge_id == bindparam("challenge_id"),
+        ChallengeInstance.user_id.is_(None),
+        _ACTIVE_STATUS_FILTER,
+        _UNEXPIRED_FILTER,
+    )
+    .order_by(ChallengeInstance.id.desc())
+    .limit(1)
+)
+
 
 class InstanceError(Exception):
     """Base error for container instance lifecycle issues."""
@@ -58,25 +228,37 @@ class ContainerService:
         base_url: Optional[str] = None,
         runner: Optional[str] = None,
     ) -> None:
-        self.ttl_seconds = ttl_seconds or int(os.getenv("CHALLENGE_INSTANCE_TIMEOUT", "3600"))
-        self.cleanup_interval = cleanup_interval or int(
-            os.getenv("CHALLENGE_INSTANCE_CLEANUP_INTERVAL", "60")
-        )
-        configured_base = (base_url or os.getenv("CHALLENGE_ACCESS_BASE_URL", "")).strip()
-        self._base_url = configured_base.rstrip("/")
-        parsed = urlparse(configured_base) if configured_base else None
-        self._base_scheme = parsed.scheme if parsed and parsed.scheme else "http"
-        self._base_host = parsed.hostname if parsed else None
-        self._base_port = parsed.port if parsed else None
-
-        preferred_network = os.getenv("CHALLENGE_CONTAINER_NETWORK")
-        self._preferred_networks = [preferred_network] if preferred_network else []
-        if "ctf_net" not in self._preferred_networks:
-            self._preferred_networks.append("ctf_net")
+        overrides: dict[str, Any] = {}
+        if ttl_seconds:
+            overrides["ttl_seconds"] = ttl_seconds
+        if cleanup_interval:
+            overrides["cleanup_interval"] = cleanup_interval
+        if base_url:
+            overrides.update(_base_url_settings(base_url))
+        if runner:
+            overrides["runner"] = runner.strip().lower() or "local"
+        self._cfg = dataclasses.replace(_CONFIG, **overrides) if overrides else _CONFIG
+        self.ttl_seconds = self._cfg.ttl_seconds
+        self.cleanup_interval = self._cfg.cleanup_interval
+        self.runner = self._cfg.runner
+
         self._resolved_network: Optional[str] = None
-        self._network_checked = False
+        # monotonic() of the last failed lookup; 0.0 means "never looked".
+        self._network_missed_at = 0.0
+        self._network_lock = asyncio.Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
-        self.runner = (runner or os.getenv("CHALLENGE_RUNNER", "local")).strip().lower() or "local"
+        # (expires_at as epoch seconds, instance id), earliest first.
+        self._expiry_heap: list[tuple[float, int]] = []
+        self._expiry_wake = asyncio.Event()
+        self._client = None
+        self._client_lock = asyncio.Lock()
+        self._docker_executor: Optional[ThreadPoolExecutor] = None
+        # image name -> (exposed port, monotonic() when inspected).
+        self._image_ports: dict[str, tuple[Optional[str], float]] = {}
+        # (challenge_id, user_id) -> id of the last instance seen active.
+        self._active_ids: dict[tuple[int, Optional[int]], int] = {}
+        self._image_port_lookups: dict[str, asyncio.Future] = {}
+        self._window_cache: dict[tuple[Optional[datetime], Optional[datetime]], tuple[float, float]] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -114,22 +296,17 @@ class ContainerService:
             return status
 
         try:
-            client = await asyncio.to_thread(self._create_docker_client)
+            client = await self._get_client()
         except Exception as exc:  # pragma: no cover - depends on docker availability
             status.update({"status": "error", "reason": str(exc)})
             return status
 
         try:
-            await asyncio.to_thread(client.ping)
+            await self._run(client.ping)
         except Exception as exc:  # pragma: no cover - depends on docker availability
             status.update({"status": "error", "reason": str(exc)})
         else:
             status.update({"status": "ok"})
-        finally:
-            try:  # pragma: no cover - best effort cleanup
-                await asyncio.to_thread(client.close)
-            except Exception:
-                pass
 
         return status
 
@@ -140,42 +317,43 @@ class ContainerService:
         challenge: Challenge,
         user: User,
     ) -> ChallengeInstance:
-        deployment = self._deployment_type(challenge)
+        deployment = deployment_type_of(challenge)
         if deployment == DeploymentType.static_attachment:
             raise InstanceNotAllowed("Challenge serves static attachments only")
 
         if deployment == DeploymentType.static_container:
             return await self.ensure_static_instance(db, challenge=challenge)
 
-        self._ensure_launchable(challenge)
+        # One clock sample serves the visibility check and the reuse lookup.
+        now = datetime.now(timezone.utc)
+        self._ensure_launchable(challenge, now=now.timestamp())
 
         existing = await self.get_latest_active_instance(
-            db, challenge_id=challenge.id, user_id=user.id
+            db, challenge_id=challenge.id, user_id=user.id, now=now
         )
         if existing:
             return existing
 
-        instance = ChallengeInstance(challenge_id=challenge.id, user_id=user.id)
-        instance.mark_starting()
-        db.add(instance)
-        await db.flush()
-        await db.refresh(instance)
+        instance, created = await self._reserve_instance(
+            db, challenge_id=challenge.id, user_id=user.id
+        )
+        if not created:
+            return instance
 
         try:
             launch = await self._launch_container(challenge=challenge, instance=instance, user=user)
         except Exception as exc:  # pragma: no cover - depends on runner availability
             message = str(exc)
+            # The row is already in the session; one commit records the error.
             instance.mark_error(message)
-            db.add(instance)
             await db.commit()
-            await db.refresh(instance)
             raise InstanceLaunchError(message) from exc
 
-        started_at = datetime.now(timezone.utc)
+        started_ts = time.time()
+        expires_ts = started_ts + self.ttl_seconds if self.ttl_seconds else None
+        started_at = datetime.fromtimestamp(started_ts, tz=timezone.utc)
         expires_at = (
-            started_at + timedelta(seconds=self.ttl_seconds)
-            if self.ttl_seconds
-            else None
+            datetime.fromtimestamp(expires_ts, tz=timezone.utc) if expires_ts is not None else None
         )
         instance.mark_running(
             container_id=launch.container_id,
@@ -183,10 +361,9 @@ class ContainerService:
             started_at=started_at,
             expires_at=expires_at,
         )
-        db.add(instance)
         await db.commit()
-        await db.refresh(instance)
-        return instance
+        self._schedule_expiry(instance.id, expires_ts)
+        return self._remember_active(instance)
 
     async def ensure_static_instance(
         self,
@@ -194,25 +371,24 @@ class ContainerService:
         *,
         challenge: Challenge,
     ) -> ChallengeInstance:
-        self._ensure_launchable(challenge)
-        existing = await self.get_shared_instance(db, challenge_id=challenge.id)
+        now = datetime.now(timezone.utc)
+        self._ensure_launchable(challenge, now=now.timestamp())
+        existing = await self.get_shared_instance(db, challenge_id=challenge.id, now=now)
         if existing:
             return existing
 
-        instance = ChallengeInstance(challenge_id=challenge.id, user_id=None)
-        instance.mark_starting()
-        db.add(instance)
-        await db.flush()
-        await db.refresh(instance)
+        instance, created = await self._reserve_instance(
+            db, challenge_id=challenge.id, user_id=None
+        )
+        if not created:
+            return instance
 
         try:
             launch = await self._launch_container(challenge=challenge, instance=instance, user=None)
         except Exception as exc:  # pragma: no cover - depends on runner availability
             message = str(exc)
             instance.mark_error(message)
-            db.add(instance)
             await db.commit()
-            await db.refresh(instance)
             raise InstanceLaunchError(message) from exc
 
         instance.mark_running(
@@ -221,10 +397,8 @@ class ContainerService:
             started_at=datetime.now(timezone.utc),
             expires_at=None,
         )
-        db.add(instance)
         await db.commit()
-        await db.refresh(instance)
-        return instance
+        return self._remember_active(instance)
 
     async def stop_instance(
         self,
@@ -234,113 +408,339 @@ class ContainerService:
     ) -> ChallengeInstance:
         if instance.status != "stopped":
             try:
-                await self._stop_container(instance.container_id)
+                await self._stop_container(instance.container_id, grace=self._cfg.stop_grace_seconds)
             except Exception as exc:  # pragma: no cover - defensive logging
                 _LOGGER.warning("Failed stopping container %s: %s", instance.container_id, exc)
         instance.mark_stopped()
+        # The instance is supplied by the caller and may come from another
+        # session; add() is a no-op when it is already attached to this one.
         db.add(instance)
         await db.commit()
-        await db.refresh(instance)
+        key = (instance.challenge_id, instance.user_id)
+        if self._active_ids.get(key) == instance.id:
+            self._active_ids.pop(key, None)
         return instance
 
-    async def get_latest_active_instance(
+    async def _reserve_instance(
         self,
         db: AsyncSession,
         *,
         challenge_id: int,
-        user_id: int,
-    ) -> Optional[ChallengeInstance]:
-        stmt = (
-            select(ChallengeInstance)
+        user_id: Optional[int],
+    ) -> tuple[ChallengeInstance, bool]:
+        """Insert a ``starting`` row, or return the row a concurrent launch won.
+
+        The unique active-instance indexes arbitrate races; the savepoint keeps
+        a losing INSERT from rolling back the caller's transaction. The flag is
+        ``True`` when the returned row was created by this call. A ``None``
+        ``user_id`` reserves the shared instance of a static challenge.
+        """
+
+        retried = False
+        while True:
+            instance = ChallengeInstance(challenge_id=challenge_id, user_id=user_id)
+            instance.mark_starting()
+            try:
+                async with db.begin_nested():
+                    db.add(instance)
+                    # flush assigns the primary key; the session does not expire
+                    # on commit and every default is Python-side, so no refresh
+                    # round-trips are needed.
+                    await db.flush()
+                return instance, True
+            except IntegrityError:
+                if user_id is None:
+                    existing = await self.get_shared_instance(db, challenge_id=challenge_id)
+                else:
+                    existing = await self.get_latest_active_instance(
+                        db, challenge_id=challenge_id, user_id=user_id
+                    )
+                if existing:
+                    return existing, False
+                if retried:
+                    raise InstanceLaunchError("Another launch is already in progress")
+                # The conflicting row has expired but has not been reaped yet.
+                await self._retire_expired_conflict(
+                    db, challenge_id=challenge_id, user_id=user_id
+                )
+                retried = True
+
+    async def _retire_expired_conflict(
+        self,
+        db: AsyncSession,
+        *,
+        challenge_id: int,
+        user_id: Optional[int],
+    ) -> None:
+        """Stop the expired active row blocking a reservation, and only that row.
+
+        Runs in the caller's transaction without committing it; the container
+        is removed straight away since the row has expired either way.
+        """
+
+        now = datetime.now(timezone.utc)
+        owner = (
+            ChallengeInstance.user_id.is_(None)
+            if user_id is None
+            else ChallengeInstance.user_id == user_id
+        )
+        result = await db.execute(
+            update(ChallengeInstance)
             .where(
                 ChallengeInstance.challenge_id == challenge_id,
-                ChallengeInstance.user_id == user_id,
-                ChallengeInstance.status.in_(ChallengeInstance.ACTIVE_STATUSES),
+                owner,
+                _ACTIVE_STATUS_FILTER,
+                ChallengeInstance.expires_at.isnot(None),
+                ChallengeInstance.expires_at < now,
             )
-            .order_by(ChallengeInstance.created_at.desc())
-            .limit(1)
+            .values(status="stopped", expires_at=now)
+            .returning(ChallengeInstance.container_id)
+            .execution_options(synchronize_session=False)
         )
-        result = await db.execute(stmt)
-        instance = result.scalars().first()
-        if not instance:
-            return None
-        if instance.is_expired():
-            await self.stop_instance(db, instance=instance)
-            return None
-        return instance
+        await self._remove_containers(result.scalars().all())
+
+    async def get_latest_active_instance(
+        self,
+        db: AsyncSession,
+        *,
+        challenge_id: int,
+        user_id: int,
+        now: Optional[datetime] = None,
+    ) -> Optional[ChallengeInstance]:
+        now = now or datetime.now(timezone.utc)
+        cached = await self._cached_active(db, challenge_id, user_id, now)
+        if cached is not None:
+            return cached
+        params = {"challenge_id": challenge_id, "user_id": user_id, "now": now}
+        return self._remember_active(await db.scalar(_LATEST_ACTIVE_STMT, params))
 
     async def get_shared_instance(
         self,
         db: AsyncSession,
         *,
         challenge_id: int,
+        now: Optional[datetime] = None,
     ) -> Optional[ChallengeInstance]:
-        stmt = (
-            select(ChallengeInstance)
-            .where(
-                ChallengeInstance.challenge_id == challenge_id,
-                ChallengeInstance.user_id.is_(None),
-                ChallengeInstance.status.in_(ChallengeInstance.ACTIVE_STATUSES),
-            )
-            .order_by(ChallengeInstance.created_at.desc())
-            .limit(1)
-        )
-        result = await db.execute(stmt)
-        instance = result.scalars().first()
-        if not instance:
-            return None
-        if instance.is_expired():
-            await self.stop_instance(db, instance=instance)
+        now = now or datetime.now(timezone.utc)
+        cached = await self._cached_active(db, challenge_id, None, now)
+        if cached is not None:
+            return cached
+        params = {"challenge_id": challenge_id, "now": now}
+        return self._remember_active(await db.scalar(_SHARED_ACTIVE_STMT, params))
+
+    async def _cached_active(
+        self, db: AsyncSession, challenge_id: int, user_id: Optional[int], now: datetime
+    ) -> Optional[ChallengeInstance]:
+        """Return the remembered active instance if it is still active.
+
+        The cache only saves the ordered index scan: the row is re-read by
+        primary key and re-checked, so another worker stopping it is noticed.
+        """
+
+        key = (challenge_id, user_id)
+        instance_id = self._active_ids.get(key)
+        if instance_id is None:
             return None
+        instance = await db.get(ChallengeInstance, instance_id)
+        if (
+            instance is not None
+            and instance.status in ChallengeInstance.ACTIVE_STATUSES
+            and not instance.is_expired(at=now)
+        ):
+            return instance
+        self._active_ids.pop(key, None)
+        return None
+
+    def _remember_active(self, instance: Optional[ChallengeInstance]) -> Optional[ChallengeInstance]:
+        if instance is not None and instance.id is not None:
+            if len(self._active_ids) >= _ACTIVE_CACHE_SIZE:
+                self._active_ids.clear()
+            self._active_ids[(instance.challenge_id, instance.user_id)] = instance.id
         return instance
 
-    async def reap_expired_instances(self, db: AsyncSession) -> int:
-        """Stop expired instances and return the number cleaned up."""
+    async def reap_expired_instances(
+        self,
+        db: AsyncSession,
+        *,
+        instance_ids: Optional[list[int]] = None,
+    ) -> int:
+        """Stop expired instances and return the number cleaned up.
+
+        ``instance_ids`` narrows the query to instances the scheduler knows are
+        due; they are still re-checked against the database before stopping.
+        """
 
         now = datetime.now(timezone.utc)
-        stmt = (
-            select(ChallengeInstance)
+        # Oldest expiries first, a bounded batch per transaction; served by
+        # the partial expiry index instead of a scan over every instance.
+        due = (
+            select(ChallengeInstance.id)
             .where(
-                ChallengeInstance.status.in_(ChallengeInstance.ACTIVE_STATUSES),
+                _ACTIVE_STATUS_FILTER,
                 ChallengeInstance.expires_at.isnot(None),
                 ChallengeInstance.expires_at < now,
             )
+            .order_by(ChallengeInstance.expires_at)
+            .limit(_REAP_BATCH_SIZE)
         )
-        result = await db.execute(stmt)
-        expired = result.scalars().all()
-        count = 0
-        for instance in expired:
-            await self.stop_instance(db, instance=instance)
-            count += 1
-        return count
+        if instance_ids is not None:
+            due = due.where(ChallengeInstance.id.in_(instance_ids))
+        stmt = (
+            update(ChallengeInstance)
+            # Re-check the status so rows stopped concurrently are skipped.
+            .where(ChallengeInstance.id.in_(due.scalar_subquery()), _ACTIVE_STATUS_FILTER)
+            .values(status="stopped", expires_at=now)
+            .returning(ChallengeInstance.container_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        total = 0
+        while True:
+            result = await db.execute(stmt)
+            container_ids = result.scalars().all()
+            await db.commit()
+            total += len(container_ids)
+            await self._remove_containers(container_ids)
+            if len(container_ids) < _REAP_BATCH_SIZE:
+                return total
+
+    async def remove_stopping_instances(self, db: AsyncSession) -> int:
+        """Remove the containers of 'stopping' rows and mark them stopped."""
+
+        result = await db.execute(_DRAIN_STOPPING_STMT)
+        container_ids = result.scalars().all()
+        await db.commit()
+        await self._remove_containers(container_ids)
+        return len(container_ids)
+
+    async def _remove_containers(self, container_ids) -> None:
+        # Rows are already marked stopped; the Docker removals then overlap,
+        # bounded by the semaphore.
+        limit = asyncio.Semaphore(self._cfg.reap_concurrency)
+
+        async def _stop(container_id: Optional[str]) -> None:
+            async with limit:
+                try:
+                    await self._stop_container(container_id)
+                except Exception as exc:  # pragma: no cover - defensive logging
+                    _LOGGER.warning("Failed stopping container %s: %s", container_id, exc)
+
+        await asyncio.gather(*(_stop(container_id) for container_id in container_ids))
 
     async def start_cleanup_task(self, session_factory) -> None:
-        if self.cleanup_interval <= 0 or self._cleanup_task:
+        if self._cleanup_task:
+            return
+        if self.cleanup_interval <= 0:
+            # No sweeps will run, so this is the only chance to remove the
+            # containers of rows a schema upgrade retired.
+            try:
+                async with session_factory() as db:
+                    await self.remove_stopping_instances(db)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                _LOGGER.error("Removing containers of stopping instances failed: %s", exc)
+            _LOGGER.warning(
+                "Challenge instance cleanup is disabled (CHALLENGE_INSTANCE_CLEANUP_INTERVAL <= 0); "
+                "expired instances and instances retired after start-up keep their containers"
+            )
             return
 
+        loop = asyncio.get_running_loop()
+
         async def _loop():
+            await self.warm_up()
+            try:
+                async with session_factory() as db:
+                    await self._load_expiries(db)
+            except asyncio.CancelledError:  # pragma: no cover - task cancelled intentionally
+                raise
+            except Exception as exc:  # pragma: no cover - defensive logging
+                _LOGGER.warning("Cleanup start-up pass failed; relying on sweeps: %s", exc)
+            next_sweep = loop.time()
             while True:
+                started = loop.time()
+                sweep = started >= next_sweep
+                due = self._pop_due_expiries()
+                if sweep or due:
+                    try:
+                        async with session_factory() as db:
+                            await self.reap_expired_instances(
+                                db, instance_ids=None if sweep else due
+                            )
+                            if sweep:
+                                # Rows retired by a schema upgrade, possibly on
+                                # another worker after this one started.
+                                await self.remove_stopping_instances(db)
+                    except asyncio.CancelledError:  # pragma: no cover - task cancelled intentionally
+                        raise
+                    except Exception as exc:  # pragma: no cover - defensive logging
+                        _LOGGER.exception("Challenge instance cleanup failed: %s", exc)
+                    if sweep:
+                        next_sweep = _next_tick(started, loop.time(), self.cleanup_interval)
+
+                delay = next_sweep - loop.time()
+                if self._expiry_heap:
+                    until_due = self._expiry_heap[0][0] - time.time()
+                    delay = min(delay, until_due)
+                self._expiry_wake.clear()
                 try:
-                    async with session_factory() as db:
-                        await self.reap_expired_instances(db)
-                except asyncio.CancelledError:  # pragma: no cover - task cancelled intentionally
-                    raise
-                except Exception as exc:  # pragma: no cover - defensive logging
-                    _LOGGER.exception("Challenge instance cleanup failed: %s", exc)
-                await asyncio.sleep(self.cleanup_interval)
+                    await asyncio.wait_for(self._expiry_wake.wait(), timeout=max(delay, 0))
+                except asyncio.TimeoutError:
+                    pass
 
         self._cleanup_task = asyncio.create_task(_loop())
 
-    async def stop_cleanup_task(self) -> None:
-        if not self._cleanup_task:
+    async def warm_up(self) -> None:
+        """Connect to Docker and resolve the container network ahead of launches."""
+
+        if docker is None or self.runner not in {"local", "docker", "remote-docker"}:
             return
-        self._cleanup_task.cancel()
         try:
-            await self._cleanup_task
-        except asyncio.CancelledError:  # pragma: no cover - expected during shutdown
-            pass
-        finally:
-            self._cleanup_task = None
+            client = await self._get_client()
+            await self._resolve_network(client)
+        except Exception as exc:  # pragma: no cover - depends on docker availability
+            _LOGGER.warning("Docker warm-up failed; retrying on first launch: %s", exc)
+
+    async def _load_expiries(self, db: AsyncSession) -> None:
+        """Schedule instances started before this process, e.g. across a restart."""
+
+        result = await db.execute(_PENDING_EXPIRIES_STMT)
+        self._expiry_heap.extend(
+            (_epoch(expires_at, default=0.0), instance_id) for expires_at, instance_id in result.all()
+        )
+        heapq.heapify(self._expiry_heap)
+        self._expiry_wake.set()
+
+    def _schedule_expiry(self, instance_id: Optional[int], expires_ts: Optional[float]) -> None:
+        if instance_id is None or expires_ts is None:
+            return
+        heapq.heappush(self._expiry_heap, (expires_ts, instance_id))
+        self._expiry_wake.set()
+
+    def _pop_due_expiries(self) -> list[int]:
+        now = time.time()
+        due: list[int] = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            due.append(heapq.heappop(self._expiry_heap)[1])
+        return due
+
+    async def stop_cleanup_task(self) -> None:
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:  # pragma: no cover - expected during shutdown
+                pass
+            finally:
+                self._cleanup_task = None
+        await self.close()
+
+    async def close(self) -> None:
+        """Release the cached Docker client and its worker threads."""
+
+        await self._close_client()
+        executor, self._docker_executor = self._docker_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     # ------------------------------------------------------------------
     # URL helpers
@@ -354,43 +754,41 @@ class ContainerService:
         path = getattr(challenge, "service_url_path", None)
         if path:
             normalized = path if path.startswith("/") else f"/{path}"
-            if self._base_url:
-                return urljoin(f"{self._base_url}/", normalized.lstrip("/"))
+            if self._cfg.base_url:
+                return f"{self._cfg.url_prefix}{normalized.lstrip('/')}"
             return normalized
 
         if instance is None:
-            return self._base_url or None
+            return self._cfg.base_url or None
 
         info = instance.connection_info or {}
         ports = info.get("ports") or []
         if ports:
             binding = ports[0]
-            host = binding.get("host") or info.get("host") or self._base_host or "localhost"
-            host = host if host not in {"0.0.0.0", ""} else (self._base_host or "localhost")
-            scheme = self._base_scheme or "http"
-            if self._base_host and host == "localhost":
-                host = self._base_host
+            host = binding.get("host") or info.get("host") or self._cfg.base_host or "localhost"
+            host = host if host not in _UNROUTABLE_HOSTS else (self._cfg.base_host or "localhost")
+            scheme = self._cfg.base_scheme or "http"
+            if self._cfg.base_host and host == "localhost":
+                host = self._cfg.base_host
             port = binding.get("host_port") or binding.get("port")
             effective_port = port
-            if not effective_port and self._base_port and host == (self._base_host or host):
-                effective_port = self._base_port
+            if not effective_port and self._cfg.base_port and host == (self._cfg.base_host or host):
+                effective_port = self._cfg.base_port
             return self._compose_url(scheme=scheme, host=host, port=effective_port)
 
-        if self._base_url:
-            return self._base_url
+        if self._cfg.base_url:
+            return self._cfg.base_url
         return None
 
     @staticmethod
     def _compose_url(*, scheme: str, host: str, port: Optional[int | str] = None, path: str = "/") -> str:
-        """Assemble a full URL using urllib.urlunparse without tuple length mistakes."""
+        """Assemble ``scheme://host[:port]/path`` from already-clean parts."""
 
         clean_path = path if path.startswith("/") else f"/{path}"
         host = host or "localhost"
         if port:
-            netloc = f"{host}:{port}"
-        else:
-            netloc = host
-        return urlunparse((scheme, netloc, clean_path, "", "", ""))
+            return f"{scheme}://{host}:{port}{clean_path}"
+        return f"{scheme}://{host}{clean_path}"
 
     # ------------------------------------------------------------------
     # Docker helpers
@@ -402,7 +800,7 @@ class ContainerService:
         instance: ChallengeInstance,
         user: Optional[User],
     ) -> LaunchResult:
-        deployment = self._deployment_type(challenge)
+        deployment = deployment_type_of(challenge)
         if deployment == DeploymentType.static_attachment:
             raise InstanceNotAllowed("Challenge does not launch containers")
 
@@ -414,71 +812,69 @@ class ContainerService:
                 "Docker SDK is not available. Install the 'docker' package or switch the runner."
             )
 
-        client = await asyncio.to_thread(self._create_docker_client)
-        try:
-            network = await self._resolve_network(client)
-            labels = {
-                "ctf.challenge_id": str(challenge.id),
-                "ctf.instance_id": str(instance.id),
-            }
-            if user is not None:
-                labels["ctf.user_id"] = str(user.id)
-            name = f"ctf_{challenge.id}_{instance.id}_{int(time.time())}"
-
-            options: dict[str, Any] = {
-                "detach": True,
-                "auto_remove": False,
-                "labels": labels,
-                "name": name,
-            }
-            if network:
-                options["network"] = network
-
-            container_port = await asyncio.to_thread(self._discover_image_port, client, challenge)
-            if container_port:
-                options.setdefault("ports", {f"{container_port}/tcp": None})
-            else:
-                options.setdefault("ports", {"80/tcp": None})
-
-            container = await asyncio.to_thread(
-                client.containers.run,
-                challenge.docker_image,
-                **options,
-            )
+        client = await self._get_client()
+        # Independent daemon lookups; on a cold cache their round trips overlap.
+        network, container_port = await asyncio.gather(
+            self._resolve_network(client),
+            self._resolve_image_port(client, challenge),
+        )
+        labels = {
+            "ctf.challenge_id": str(challenge.id),
+            "ctf.instance_id": str(instance.id),
+        }
+        if user is not None:
+            labels["ctf.user_id"] = str(user.id)
+        # instance.id is already unique per database; the suffix keeps names
+        # distinct across database resets on the same daemon.
+        name = f"ctf_{challenge.id}_{instance.id}_{next(_NAME_SUFFIXES):x}"
+
+        options: dict[str, Any] = {
+            "detach": True,
+            "auto_remove": False,
+            "labels": labels,
+            "name": name,
+        }
+        if network:
+            options["network"] = network
+
+        if container_port:
+            options.setdefault("ports", {f"{container_port}/tcp": None})
+        else:
+            options.setdefault("ports", {"80/tcp": None})
 
-            await asyncio.to_thread(container.reload)
-            info = container.attrs or {}
-            network_settings = info.get("NetworkSettings", {})
-            ports_info = network_settings.get("Ports", {})
-            mapped: list[dict[str, Any]] = []
-            for container_port_key, bindings in (ports_info or {}).items():
-                if not bindings:
-                    continue
-                for binding in bindings:
-                    mapped.append(
-                        {
-                            "container_port": container_port_key,
-                            "host": binding.get("HostIp") or self._base_host or "localhost",
-                            "host_port": binding.get("HostPort"),
-                        }
-                    )
+        container = await self._run(
+            client.containers.run,
+            challenge.docker_image,
+            **options,
+        )
+
+        host = self._cfg.base_host or "localhost"
+        service_path = getattr(challenge, "service_url_path", None)
+        if service_path and network:
+            # Path-routed challenges are reached through the proxy on the
+            # shared network, so the published host ports are never used.
+            connection = {"host": host, "ports": [], "path": service_path, "network": network}
+            return LaunchResult(container_id=container.id, connection_info=connection)
 
-            connection = {
-                "host": self._base_host or "localhost",
-                "ports": mapped,
+        info = await self._run(client.api.inspect_container, container.id)
+        ports_info = (info or {}).get("NetworkSettings", {}).get("Ports") or {}
+        mapped: list[dict[str, Any]] = [
+            {
+                "container_port": container_port_key,
+                "host": binding.get("HostIp") or host,
+                "host_port": binding.get("HostPort"),
             }
-            service_path = getattr(challenge, "service_url_path", None)
-            if service_path:
-                connection["path"] = service_path
-            if network:
-                connection["network"] = network
+            for container_port_key, bindings in ports_info.items()
+            for binding in bindings or ()
+        ]
 
-            return LaunchResult(container_id=container.id, connection_info=connection)
-        finally:  # pragma: no cover - closing client is best effort
-            try:
-                await asyncio.to_thread(client.close)
-            except Exception:
-                pass
+        connection = {"host": host, "ports": mapped}
+        if service_path:
+            connection["path"] = service_path
+        if network:
+            connection["network"] = network
+
+        return LaunchResult(container_id=container.id, connection_info=connection)
 
     async def _launch_kubernetes(
         self,
@@ -491,58 +887,81 @@ class ContainerService:
             "Kubernetes runner is not implemented. Set CHALLENGE_RUNNER to 'local' or 'remote-docker'."
         )
 
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking Docker SDK call on the dedicated Docker thread pool."""
+
+        if self._docker_executor is None:
+            self._docker_executor = ThreadPoolExecutor(
+                max_workers=self._cfg.docker_workers, thread_name_prefix="docker"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._docker_executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _get_client(self):
+        """Return the shared Docker client, connecting on first use."""
+
+        client = self._client
+        if client is not None:
+            return client
+        async with self._client_lock:
+            if self._client is None:
+                self._client = await self._run(self._create_docker_client)
+            return self._client
+
+    async def _close_client(self) -> None:
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:  # pragma: no cover - best effort cleanup
+            await self._run(client.close)
+        except Exception:
+            pass
+
     def _create_docker_client(self):
         if docker is None:  # pragma: no cover - enforced earlier
             raise RuntimeError("Docker SDK not available")
 
+        pool_size = self._cfg.docker_pool_size
         if self.runner in {"local", "docker"}:
-            return docker.from_env()
+            return docker.from_env(max_pool_size=pool_size)
 
         if self.runner == "remote-docker":
-            base_url = os.getenv("CHALLENGE_DOCKER_HOST")
-            if not base_url:
+            cfg = self._cfg
+            if not cfg.docker_host:
                 raise RuntimeError("CHALLENGE_DOCKER_HOST must be set for remote Docker runner")
 
-            tls_verify = os.getenv("CHALLENGE_DOCKER_TLS_VERIFY", "1").strip().lower() in {
-                "1",
-                "true",
-                "yes",
-                "on",
-            }
-            if tls_verify:
-                ca_cert = os.getenv("CHALLENGE_DOCKER_TLS_CA_CERT")
-                client_cert = os.getenv("CHALLENGE_DOCKER_TLS_CERT")
-                client_key = os.getenv("CHALLENGE_DOCKER_TLS_KEY")
-                tls_config = None
-                if client_cert and client_key:
-                    from docker import tls  # type: ignore
+            if cfg.tls_verify:
+                from docker import tls  # type: ignore
 
+                if cfg.tls_cert and cfg.tls_key:
                     tls_config = tls.TLSConfig(
-                        client_cert=(client_cert, client_key),
-                        ca_cert=ca_cert,
+                        client_cert=(cfg.tls_cert, cfg.tls_key),
+                        ca_cert=cfg.tls_ca_cert,
                         verify=True,
                     )
                 else:
-                    from docker import tls  # type: ignore
-
-                    tls_config = tls.TLSConfig(ca_cert=ca_cert, verify=True)
-                return docker.DockerClient(base_url=base_url, tls=tls_config)
-            return docker.DockerClient(base_url=base_url)
+                    tls_config = tls.TLSConfig(ca_cert=cfg.tls_ca_cert, verify=True)
+                return docker.DockerClient(
+                    base_url=cfg.docker_host, tls=tls_config, max_pool_size=pool_size
+                )
+            return docker.DockerClient(base_url=cfg.docker_host, max_pool_size=pool_size)
 
         raise RuntimeError(f"Unsupported challenge runner '{self.runner}'")
 
     def _coerce_port(self, value: Any) -> Optional[str]:
         if value is None:
             return None
-        try:
-            number = int(str(value).split("/")[0])
-        except (TypeError, ValueError):
-            return None
-        if number <= 0:
+        if type(value) is int:
+            return str(value) if value > 0 else None
+        match = _PORT_RE.match(str(value))
+        if match is None:
             return None
-        return str(number)
+        number = int(match.group(1))
+        return str(number) if number > 0 else None
 
-    def _discover_image_port(self, client, challenge) -> Optional[str]:
+    def _port_hint(self, challenge) -> Optional[str]:
         hints = [
             getattr(challenge, "service_port", None),
             getattr(challenge, "service_internal_port", None),
@@ -552,17 +971,10 @@ class ContainerService:
             port = self._coerce_port(hint)
             if port:
                 return port
+        return None
 
-        image_name = getattr(challenge, "docker_image", None)
-        if not image_name:
-            return None
-
-        try:
-            image = client.images.get(image_name)
-        except Exception as exc:  # pragma: no cover - depends on docker availability
-            _LOGGER.warning("Unable to inspect image %s for exposed ports: %s", image_name, exc)
-            return None
-
+    def _exposed_image_port(self, client, image_name: str) -> Optional[str]:
+        image = client.images.get(image_name)
         attrs = getattr(image, "attrs", {}) or {}
         for key in ("Config", "ContainerConfig"):
             config = attrs.get(key) or {}
@@ -573,78 +985,146 @@ class ContainerService:
                     return port
         return None
 
-    async def _stop_container(self, container_id: Optional[str]) -> None:
+    async def _resolve_image_port(self, client, challenge) -> Optional[str]:
+        """Port to publish: the challenge's hint, else the image's exposed port.
+
+        Successful inspections are cached per image name for
+        ``_IMAGE_PORT_TTL`` seconds and concurrent lookups share one in-flight
+        request. Failures are not cached: the image may simply not be pulled
+        yet.
+        """
+
+        port = self._port_hint(challenge)
+        image_name = getattr(challenge, "docker_image", None)
+        if port or not image_name:
+            return port
+        cached = self._image_ports.get(image_name)
+        if cached is not None and time.monotonic() - cached[1] < _IMAGE_PORT_TTL:
+            return cached[0]
+
+        pending = self._image_port_lookups.get(image_name)
+        if pending is None:
+            pending = asyncio.ensure_future(self._run(self._exposed_image_port, client, image_name))
+            self._image_port_lookups[image_name] = pending
+            pending.add_done_callback(lambda _: self._image_port_lookups.pop(image_name, None))
+        try:
+            port = await asyncio.shield(pending)
+        except Exception as exc:  # pragma: no cover - depends on docker availability
+            _LOGGER.warning("Unable to inspect image %s for exposed ports: %s", image_name, exc)
+            return None
+        self._image_ports[image_name] = (port, time.monotonic())
+        return port
+
+    async def _stop_container(self, container_id: Optional[str], *, grace: int = 0) -> None:
+        """Remove a container, optionally giving it ``grace`` seconds to exit.
+
+        A forced remove kills and deletes in one Docker call; ``v=True`` also
+        drops the container's anonymous volumes.
+        """
+
         if not container_id:
             return
         if docker is None:
             return
-        client = await asyncio.to_thread(self._create_docker_client)
+        # The low-level API addresses the container by id, so no inspect call
+        # is spent building a Container model just to remove it.
+        api = (await self._get_client()).api
         try:
-            try:
-                container = await asyncio.to_thread(client.containers.get, container_id)
-            except DockerException as exc:
-                _LOGGER.warning("Container %s not found: %s", container_id, exc)
-                return
-            await asyncio.to_thread(container.stop)
-            await asyncio.to_thread(container.remove, force=True)
-        finally:  # pragma: no cover
-            try:
-                await asyncio.to_thread(client.close)
-            except Exception:
-                pass
+            if grace > 0:
+                await self._run(api.stop, container_id, timeout=grace)
+            await self._run(api.remove_container, container_id, force=True, v=True)
+        except NotFound as exc:
+            _LOGGER.warning("Container %s not found: %s", container_id, exc)
 
     async def _resolve_network(self, client) -> Optional[str]:
-        if self._network_checked:
+        if self._resolved_network is not None:
             return self._resolved_network
+        # Concurrent first launches share one round of probes.
+        async with self._network_lock:
+            return await self._probe_networks(client)
 
-        for candidate in self._preferred_networks:
-            if not candidate:
-                continue
-            try:
-                await asyncio.to_thread(client.networks.get, candidate)
-            except DockerException:
-                continue
-            else:
-                self._resolved_network = candidate
-                break
+    async def _probe_networks(self, client) -> Optional[str]:
+        if self._resolved_network is not None:
+            return self._resolved_network
+        if self._network_missed_at and time.monotonic() - self._network_missed_at < _NETWORK_MISS_TTL:
+            return None
 
-        self._network_checked = True
-        return self._resolved_network
+        # Probe every candidate at once; the first one that exists, in
+        # preference order, wins.
+        candidates = [candidate for candidate in self._cfg.preferred_networks if candidate]
+        results = await asyncio.gather(
+            *(self._run(client.networks.get, candidate) for candidate in candidates),
+            return_exceptions=True,
+        )
+        for candidate, result in zip(candidates, results):
+            if isinstance(result, DockerException):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            self._resolved_network = candidate
+            return candidate
+
+        # Misses may be transient (daemon restart, network created later), so
+        # they are only remembered briefly.
+        self._network_missed_at = time.monotonic()
+        return None
 
     # ------------------------------------------------------------------
     # Validation helpers
     # ------------------------------------------------------------------
-    def _deployment_type(self, challenge: Challenge) -> DeploymentType:
-        deployment = getattr(challenge, "deployment_type", DeploymentType.dynamic_container)
-        if isinstance(deployment, str):
-            try:
-                deployment = DeploymentType(deployment)
-            except ValueError:
-                deployment = DeploymentType.dynamic_container
-        return deployment
-
-    def _ensure_launchable(self, challenge: Challenge) -> None:
+    def _ensure_launchable(self, challenge: Challenge, *, now: Optional[float] = None) -> None:
         if not challenge.is_active or getattr(challenge, "is_private", False):
             raise InstanceNotAllowed("Challenge is not active")
 
-        deployment = self._deployment_type(challenge)
+        deployment = deployment_type_of(challenge)
         if deployment == DeploymentType.static_attachment:
             raise InstanceNotAllowed("Challenge serves static attachments only")
 
         if not challenge.docker_image:
             raise InstanceNotAllowed("Challenge does not have a docker image configured")
 
-        now = datetime.now(timezone.utc)
-        start = getattr(challenge, "visible_from", None)
-        if start:
-            start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
-            if now < start:
-                raise InstanceNotAllowed("Challenge is not yet visible")
-        end = getattr(challenge, "visible_to", None)
-        if end:
-            end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
-            if now > end:
-                raise InstanceNotAllowed("Challenge is no longer visible")
+        lo, hi = self._visibility_window(
+            getattr(challenge, "visible_from", None),
+            getattr(challenge, "visible_to", None),
+        )
+        now = time.time() if now is None else now
+        if now < lo:
+            raise InstanceNotAllowed("Challenge is not yet visible")
+        if now > hi:
+            raise InstanceNotAllowed("Challenge is no longer visible")
+
+    def _visibility_window(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> tuple[float, float]:
+        """Return the visibility window as epoch seconds, memoized per bound pair."""
+
+        key = (start, end)
+        window = self._window_cache.get(key)
+        if window is None:
+            if len(self._window_cache) >= _WINDOW_CACHE_SIZE:
+                self._window_cache.clear()
+            window = (_epoch(start, default=float("-inf")), _epoch(end, default=float("inf")))
+            self._window_cache[key] = window
+        return window
+
+
+def _next_tick(started: float, now: float, interval: float) -> float:
+    """Return the next fixed-rate tick after ``now``.
+
+    Ticks stay on the ``started + k * interval`` grid; ticks missed while a
+    slow sweep was running are skipped rather than run back to back.
+    """
+
+    missed = (now - started) // interval
+    return started + (missed + 1) * interval
+
+
+def _epoch(value: Optional[datetime], *, default: float) -> float:
+    if not value:
+        return default
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
 
 
 _service: Optional[ContainerService] = None
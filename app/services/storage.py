@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import os
 import pathlib
 import re
+import shutil
 from dataclasses import dataclass
 from typing import AsyncIterator, Optional
 
@@ -16,12 +18,33 @@ try:
 except Exception:  # pragma: no cover - aiofiles should be installed
     aiofiles = None
 
-try:  # optional dependency for S3-compatible stores
-    import boto3
-    from botocore.exceptions import BotoCoreError, ClientError
-except Exception:  # pragma: no cover - boto3 optional
-    boto3 = None
-    BotoCoreError = ClientError = Exception
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+# Buffer used when copying an upload to local storage.
+_COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+@functools.cache
+def _load_boto3():
+    """Import boto3 on first use; it is slow to import and only S3 needs it.
+
+    Returns the module and the client error types to catch, or ``(None, ())``
+    when the optional dependency is missing.
+    """
+
+    try:  # optional dependency for S3-compatible stores
+        import boto3
+        from botocore.exceptions import BotoCoreError, ClientError
+    except Exception:  # pragma: no cover - boto3 optional
+        return None, ()
+    return boto3, (BotoCoreError, ClientError)
+
+
+def _copy_to_path(source, path: pathlib.Path) -> int:
+    source.seek(0)
+    with open(path, "wb") as target:
+        shutil.copyfileobj(source, target, _COPY_CHUNK_SIZE)
+        return target.tell()
 
 
 @dataclass
@@ -57,7 +80,7 @@ class LocalAttachmentStorage(AttachmentStorage):
 
     def _sanitize_filename(self, filename: str) -> str:
         name = pathlib.Path(filename).name
-        name = re.sub(r"[^A-Za-z0-9._-]", "_", name).strip("._") or "attachment"
+        name = _UNSAFE_FILENAME_CHARS_RE.sub("_", name).strip("._") or "attachment"
         return name
 
     def _path_for(self, challenge_id: int, filename: str) -> pathlib.Path:
@@ -79,18 +102,9 @@ class LocalAttachmentStorage(AttachmentStorage):
         safe_name = f"{int(asyncio.get_running_loop().time() * 1_000_000)}_{filename}"
         path = self._path_for(challenge_id, safe_name)
 
-        if aiofiles is None:
-            data = await upload.read()
-            size = await asyncio.to_thread(lambda: path.write_bytes(data) or len(data))
-        else:
-            size = 0
-            async with aiofiles.open(path, "wb") as buffer:
-                while True:
-                    chunk = await upload.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    size += len(chunk)
-                    await buffer.write(chunk)
+        # The whole copy runs in one worker thread rather than hopping to a
+        # thread for every chunk read from the upload and written to disk.
+        size = await asyncio.to_thread(_copy_to_path, upload.file, path)
         await upload.close()
         relative = f"{challenge_id}/{safe_name}"
         return StorageResult(backend=self.backend_name, path=relative, size=size)
@@ -136,6 +150,7 @@ class S3AttachmentStorage(AttachmentStorage):
     backend_name = "s3"
 
     def __init__(self) -> None:
+        boto3, self._client_errors = _load_boto3()
         if boto3 is None:
             raise RuntimeError("boto3 is required for S3 attachment storage")
         bucket = os.getenv("ATTACHMENT_S3_BUCKET")
@@ -151,7 +166,7 @@ class S3AttachmentStorage(AttachmentStorage):
 
     async def save(self, challenge_id: int, upload: UploadFile) -> StorageResult:
         filename = pathlib.Path(upload.filename or "attachment").name
-        filename = re.sub(r"[^A-Za-z0-9._-]", "_", filename).strip("._") or "attachment"
+        filename = _UNSAFE_FILENAME_CHARS_RE.sub("_", filename).strip("._") or "attachment"
         key = f"{challenge_id}/{int(asyncio.get_running_loop().time() * 1_000_000)}_{filename}"
 
         def _upload():
@@ -159,7 +174,7 @@ class S3AttachmentStorage(AttachmentStorage):
 
         try:
             await asyncio.to_thread(_upload)
-        except (BotoCoreError, ClientError) as exc:  # pragma: no cover
+        except self._client_errors as exc:  # pragma: no cover
             raise HTTPException(status_code=500, detail=f"Failed to store attachment: {exc}") from exc
         size = upload.file.tell()
         await upload.close()
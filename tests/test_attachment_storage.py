@@ -17,6 +17,7 @@ def test_local_storage_roundtrip(tmp_path: Path):
         result = await storage.save(7, upload)
 
         assert result.backend == "local"
+        assert result.size == len(b"hello world")
         saved_path = storage_path / result.path
         assert saved_path.exists()
         assert str(result.path).startswith("7/")
@@ -45,3 +46,12 @@ def test_local_storage_roundtrip(tmp_path: Path):
         assert not saved_path.exists()
 
     asyncio.run(_run())
+
+
+def test_storage_import_defers_boto3():
+    import subprocess
+    import sys
+
+    root = Path(__file__).resolve().parents[1]
+    code = "import sys, app.services.storage; assert 'boto3' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
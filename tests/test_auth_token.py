@@ -0,0 +1,50 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from jose import jwt
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app import auth_token  # noqa: E402
+
+
+def test_hs256_fast_path_matches_jose():
+    data = {"user_id": 5}
+    token = auth_token.create_access_token(data)
+
+    claims = jwt.decode(token, auth_token.SECRET_KEY, algorithms=["HS256"])
+    assert claims["user_id"] == 5
+    assert "exp" not in data
+    assert token == jwt.encode(claims, auth_token.SECRET_KEY, algorithm="HS256")
+
+
+def test_other_algorithms_use_jose(monkeypatch):
+    monkeypatch.setattr(auth_token, "ALGORITHM", "HS512")
+
+    token = auth_token.create_access_token({"user_id": 9})
+
+    assert jwt.get_unverified_header(token)["alg"] == "HS512"
+    assert jwt.decode(token, auth_token.SECRET_KEY, algorithms=["HS512"])["user_id"] == 9
+
+
+def test_datetime_claims_fall_back_to_jose():
+    issued = datetime.now(timezone.utc)
+
+    token = auth_token.create_access_token({"user_id": 3, "iat": issued, "exp": issued})
+
+    claims = jwt.decode(token, auth_token.SECRET_KEY, algorithms=["HS256"])
+    assert claims["user_id"] == 3
+    assert claims["iat"] == int(issued.timestamp())
+    # The token's own expiry replaces the caller's exp.
+    assert claims["exp"] > claims["iat"]
+
+
+def test_hs256_fast_path_uses_current_secret(monkeypatch):
+    monkeypatch.setattr(auth_token, "SECRET_KEY", "rotated-secret")
+
+    token = auth_token.create_access_token({"user_id": 4})
+
+    assert jwt.decode(token, "rotated-secret", algorithms=["HS256"])["user_id"] == 4
@@ -1,4 +1,8 @@
 import asyncio
+import contextlib
+import dataclasses
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
@@ -36,6 +40,23 @@ class _FakeSession:
     async def execute(self, stmt):
         return _FakeResult(self._result_instances)
 
+    async def scalar(self, stmt, params=None):
+        return self._result_instances[0] if self._result_instances else None
+
+    async def get(self, model, ident):
+        return next((obj for obj in self._result_instances if getattr(obj, "id", None) == ident), None)
+
+    def begin_nested(self):
+        return _FakeTransaction()
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
 
 class _FakeResult:
     def __init__(self, items):
@@ -44,6 +65,9 @@ class _FakeResult:
     def scalars(self):
         return _FakeScalarResult(self._items)
 
+    def all(self):
+        return list(self._items)
+
 
 class _FakeScalarResult:
     def __init__(self, items):
@@ -78,6 +102,29 @@ def _make_user(user_id: int = 42) -> SimpleNamespace:
     return SimpleNamespace(id=user_id)
 
 
+@pytest.fixture
+def instance_db():
+    """Open an in-memory SQLite database holding just the instances table.
+
+    Tests drive their own event loop, so the fixture hands back an async
+    context manager that yields a session factory and disposes the engine.
+    """
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    @contextlib.asynccontextmanager
+    async def _open():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(ChallengeInstance.__table__.create)
+        try:
+            yield async_sessionmaker(engine, expire_on_commit=False)
+        finally:
+            await engine.dispose()
+
+    return _open
+
+
 def test_start_instance_marks_running(monkeypatch):
     async def _run():
         service = ContainerService(ttl_seconds=30, cleanup_interval=0, base_url="http://access")
@@ -131,6 +178,29 @@ def test_ensure_static_instance_reuses_running(monkeypatch):
     asyncio.run(_run())
 
 
+def test_ensure_static_instance_commits_once_without_refresh(monkeypatch):
+    class _NoRefreshSession(_FakeSession):
+        async def refresh(self, obj):  # pragma: no cover - should not run
+            raise AssertionError("refresh should not be called")
+
+    async def _run():
+        challenge = _make_challenge(deployment_type=DeploymentType.static_container)
+        service = ContainerService(cleanup_interval=0)
+        session = _NoRefreshSession()
+
+        async def _fake_launch(**kwargs):
+            return LaunchResult(container_id="shared", connection_info={"host": "localhost", "ports": []})
+
+        monkeypatch.setattr(service, "_launch_container", _fake_launch)
+
+        instance = await service.ensure_static_instance(session, challenge=challenge)
+        assert instance.status == "running"
+        assert instance.container_id == "shared"
+        assert session.commit_count == 1
+
+    asyncio.run(_run())
+
+
 def test_build_access_url_uses_host_port():
     service = ContainerService()
     challenge = _make_challenge(service_url_path=None)
@@ -159,18 +229,20 @@ def test_coerce_port_variants():
     assert service._coerce_port(1234) == "1234"
     assert service._coerce_port("invalid") is None
     assert service._coerce_port(0) is None
+    assert service._coerce_port(" 53/udp ") == "53"
+    assert service._coerce_port("80.0") is None
 
 
-def test_discover_image_port_prefers_hints(monkeypatch):
+def test_resolve_image_port_prefers_hints(monkeypatch):
     service = ContainerService()
     challenge = _make_challenge(service_port=5000, service_url_path=None)
     fake_client = SimpleNamespace(images=None)
 
-    port = service._discover_image_port(fake_client, challenge)
+    port = asyncio.run(service._resolve_image_port(fake_client, challenge))
     assert port == "5000"
 
 
-def test_discover_image_port_uses_image_metadata(monkeypatch):
+def test_resolve_image_port_uses_image_metadata(monkeypatch):
     service = ContainerService()
     challenge = _make_challenge(service_port=None, service_url_path=None)
 
@@ -181,8 +253,53 @@ def test_discover_image_port_uses_image_metadata(monkeypatch):
 
     fake_client = SimpleNamespace(images=_FakeImages())
 
-    port = service._discover_image_port(fake_client, challenge)
-    assert port == "7777"
+    async def _run():
+        try:
+            return await service._resolve_image_port(fake_client, challenge)
+        finally:
+            await service.close()
+
+    assert asyncio.run(_run()) == "7777"
+
+
+def test_resolve_image_port_inspects_each_image_once():
+    from app.services import container_service
+
+    service = ContainerService()
+    challenge = _make_challenge(service_port=None, service_url_path=None)
+    lookups = []
+    release = threading.Event()
+
+    class _FakeImages:
+        def get(self, name):
+            lookups.append(name)
+            # Held until every caller is waiting on the in-flight inspection.
+            release.wait(5)
+            return SimpleNamespace(attrs={"Config": {"ExposedPorts": {"7777/tcp": {}}}})
+
+    fake_client = SimpleNamespace(images=_FakeImages())
+
+    async def _run():
+        callers = [
+            asyncio.ensure_future(service._resolve_image_port(fake_client, challenge))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        ports = list(await asyncio.gather(*callers))
+        ports.append(await service._resolve_image_port(fake_client, challenge))
+        # Once the entry is older than the TTL the image is inspected again.
+        port, seen = service._image_ports[challenge.docker_image]
+        service._image_ports[challenge.docker_image] = (
+            port,
+            seen - container_service._IMAGE_PORT_TTL - 1,
+        )
+        ports.append(await service._resolve_image_port(fake_client, challenge))
+        await service.close()
+        return ports
+
+    assert asyncio.run(_run()) == ["7777"] * 6
+    assert lookups == [challenge.docker_image] * 2
 
 
 def test_start_instance_rejects_static_attachment():
@@ -198,6 +315,19 @@ def test_start_instance_rejects_static_attachment():
     asyncio.run(_run())
 
 
+def test_ensure_launchable_checks_visibility_window():
+    service = ContainerService()
+    now = datetime.now(timezone.utc)
+
+    service._ensure_launchable(_make_challenge(visible_from=None, visible_to=None))
+    with pytest.raises(InstanceNotAllowed, match="not yet visible"):
+        service._ensure_launchable(_make_challenge(visible_from=now + timedelta(hours=1)))
+    # Naive datetimes are treated as UTC.
+    naive_past = (now - timedelta(hours=1)).replace(tzinfo=None)
+    with pytest.raises(InstanceNotAllowed, match="no longer visible"):
+        service._ensure_launchable(_make_challenge(visible_to=naive_past))
+
+
 def test_launch_error_marks_instance(monkeypatch):
     async def _run():
         service = ContainerService()
@@ -218,4 +348,654 @@ def test_launch_error_marks_instance(monkeypatch):
         with pytest.raises(InstanceLaunchError):
             await service.start_instance(session, challenge=challenge, user=user)
 
+        assert [instance.status for instance in session.added] == ["error"]
+        assert session.added[0].error_message == "no docker"
+        assert session.commit_count == 1
+
+    asyncio.run(_run())
+
+
+def test_docker_client_is_shared_and_closed_on_shutdown(monkeypatch):
+    async def _run():
+        service = ContainerService(cleanup_interval=0)
+        created = []
+
+        class _FakeClient:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        def _create():
+            created.append(_FakeClient())
+            return created[-1]
+
+        monkeypatch.setattr(service, "_create_docker_client", _create)
+
+        clients = await asyncio.gather(*(service._get_client() for _ in range(5)))
+        first = await service._get_client()
+        assert all(client is first for client in clients)
+        assert len(created) == 1
+
+        await service.stop_cleanup_task()
+        assert first.closed
+        assert service._client is None
+
+        assert await service._get_client() is not first
+        await service.close()
+        assert created[-1].closed
+
+    asyncio.run(_run())
+
+
+def test_cleanup_task_reaps_scheduled_expiry(monkeypatch):
+    async def _run():
+        service = ContainerService(cleanup_interval=3600)
+        calls = asyncio.Queue()
+
+        async def _fake_reap(db, *, instance_ids=None):
+            calls.put_nowait(instance_ids)
+            return 0
+
+        class _SessionFactory:
+            async def __aenter__(self):
+                return _FakeSession()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        async def _fake_drain(db):
+            calls.put_nowait("stopping")
+            return 0
+
+        monkeypatch.setattr(service, "reap_expired_instances", _fake_reap)
+        monkeypatch.setattr(service, "remove_stopping_instances", _fake_drain)
+
+        await service.start_cleanup_task(_SessionFactory)
+        # one startup sweep, which also drains 'stopping' rows, then only the
+        # scheduled instance
+        assert await asyncio.wait_for(calls.get(), timeout=5) is None
+        assert await asyncio.wait_for(calls.get(), timeout=5) == "stopping"
+        service._schedule_expiry(7, time.time() - 1)
+        assert await asyncio.wait_for(calls.get(), timeout=5) == [7]
+        await service.stop_cleanup_task()
+        assert calls.empty()
+
+    asyncio.run(_run())
+
+
+def test_disabled_cleanup_still_removes_stopping_instances(monkeypatch, caplog):
+    async def _run():
+        service = ContainerService()
+        # The constructor treats 0 as "use the environment default".
+        service.cleanup_interval = 0
+        drained = []
+
+        async def _fake_drain(db):
+            drained.append(db)
+            return 1
+
+        class _SessionFactory:
+            async def __aenter__(self):
+                return _FakeSession()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        monkeypatch.setattr(service, "remove_stopping_instances", _fake_drain)
+        await service.start_cleanup_task(_SessionFactory)
+        assert service._cleanup_task is None
+        return drained
+
+    with caplog.at_level("WARNING", logger="app.services.container_service"):
+        assert len(asyncio.run(_run())) == 1
+    assert "cleanup is disabled" in caplog.text
+
+
+def test_reap_stops_expired_instances_concurrently(monkeypatch):
+    async def _run():
+        service = ContainerService(cleanup_interval=0)
+        # The bulk UPDATE ... RETURNING yields the affected container ids.
+        session = _FakeSession(instances=["c0", "c1", "c2"])
+        in_flight = []
+        peak = []
+
+        async def _fake_stop(container_id):
+            in_flight.append(container_id)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(container_id)
+
+        monkeypatch.setattr(service, "_stop_container", _fake_stop)
+
+        count = await service.reap_expired_instances(session)
+
+        assert count == 3
+        assert max(peak) == 3
+        assert session.commit_count == 1
+
+        service._cfg = dataclasses.replace(service._cfg, reap_concurrency=2)
+        peak.clear()
+        assert await service.reap_expired_instances(session) == 3
+        assert max(peak) == 2
+
+    asyncio.run(_run())
+
+
+def test_launch_inspects_ports_only_when_needed(monkeypatch):
+    inspected = []
+
+    class _FakeAPI:
+        def inspect_container(self, container_id):
+            inspected.append(container_id)
+            return {"NetworkSettings": {"Ports": {"80/tcp": [{"HostIp": "0.0.0.0", "HostPort": "49153"}]}}}
+
+    class _FakeContainers:
+        def run(self, image, **options):
+            return SimpleNamespace(id="c1")
+
+    client = SimpleNamespace(api=_FakeAPI(), containers=_FakeContainers())
+
+    async def _run(service_path, network):
+        service = ContainerService(cleanup_interval=0)
+
+        async def _fake_get_client():
+            return client
+
+        async def _fake_network(_client):
+            return network
+
+        monkeypatch.setattr(service, "_get_client", _fake_get_client)
+        monkeypatch.setattr(service, "_resolve_network", _fake_network)
+        async def _fake_port(*_):
+            return 80
+
+        monkeypatch.setattr(service, "_resolve_image_port", _fake_port)
+        return await service._launch_container(
+            challenge=_make_challenge(service_url_path=service_path),
+            instance=SimpleNamespace(id=5),
+            user=_make_user(),
+        )
+
+    routed = asyncio.run(_run("/challenge1/", "ctf_net"))
+    assert routed.connection_info["ports"] == []
+    assert inspected == []
+
+    published = asyncio.run(_run(None, None))
+    assert published.connection_info["ports"][0]["host_port"] == "49153"
+    assert inspected == ["c1"]
+
+
+def test_launch_overlaps_network_and_port_lookups(monkeypatch):
+    class _FakeContainers:
+        def run(self, image, **options):
+            return SimpleNamespace(id="c1", options=options)
+
+    client = SimpleNamespace(containers=_FakeContainers())
+
+    async def _run():
+        service = ContainerService(cleanup_interval=0)
+        port_started = asyncio.Event()
+
+        async def _fake_get_client():
+            return client
+
+        async def _fake_network(_client):
+            # Only completes if the port lookup is already in flight.
+            await asyncio.wait_for(port_started.wait(), timeout=1)
+            return "ctf_net"
+
+        async def _fake_port(*_):
+            port_started.set()
+            return "8080"
+
+        monkeypatch.setattr(service, "_get_client", _fake_get_client)
+        monkeypatch.setattr(service, "_resolve_network", _fake_network)
+        monkeypatch.setattr(service, "_resolve_image_port", _fake_port)
+        return await service._launch_container(
+            challenge=_make_challenge(service_url_path="/c/"),
+            instance=SimpleNamespace(id=5),
+            user=_make_user(),
+        )
+
+    result = asyncio.run(_run())
+    assert result.connection_info["network"] == "ctf_net"
+
+
+def test_stop_container_force_removes_in_one_call(monkeypatch):
+    calls = []
+
+    class _FakeAPI:
+        def stop(self, container_id, timeout=None):
+            calls.append(("stop", container_id, timeout))
+
+        def remove_container(self, container_id, force=False, v=False):
+            calls.append(("remove", container_id, force, v))
+
+    async def _run():
+        service = ContainerService(cleanup_interval=0)
+
+        async def _fake_get_client():
+            return SimpleNamespace(api=_FakeAPI())
+
+        monkeypatch.setattr(service, "_get_client", _fake_get_client)
+        await service._stop_container("c9")
+        await service._stop_container("c10", grace=5)
+
+    asyncio.run(_run())
+    assert calls == [
+        ("remove", "c9", True, True),
+        ("stop", "c10", 5),
+        ("remove", "c10", True, True),
+    ]
+
+
+def test_network_misses_are_retried_after_ttl():
+    from app.services import container_service
+
+    lookups = []
+    available = set()
+
+    class _FakeNetworks:
+        def get(self, name):
+            lookups.append(name)
+            if name not in available:
+                raise container_service.DockerException("missing")
+
+    client = SimpleNamespace(networks=_FakeNetworks())
+    service = ContainerService(cleanup_interval=0)
+    service._cfg = dataclasses.replace(service._cfg, preferred_networks=("ctf_net",))
+
+    async def _run():
+        assert await service._resolve_network(client) is None
+        assert await service._resolve_network(client) is None
+        assert lookups == ["ctf_net"]
+
+        available.add("ctf_net")
+        service._network_missed_at -= container_service._NETWORK_MISS_TTL + 1
+        assert await service._resolve_network(client) == "ctf_net"
+        assert await service._resolve_network(client) == "ctf_net"
+        assert lookups == ["ctf_net", "ctf_net"]
+
+    asyncio.run(_run())
+
+
+def test_network_probes_run_together_and_keep_preference_order():
+    from app.services import container_service
+
+    started = []
+    # Every probe has to be in flight before any of them may answer.
+    all_started = threading.Barrier(3, timeout=5)
+    bridge_b_answered = threading.Event()
+
+    class _FakeNetworks:
+        def get(self, name):
+            started.append(name)
+            all_started.wait()
+            if name == "ctf_net":
+                raise container_service.DockerException("missing")
+            if name == "bridge_b":
+                bridge_b_answered.set()
+                return
+            # The preferred hit answers after the lower-priority one.
+            bridge_b_answered.wait(5)
+
+    client = SimpleNamespace(networks=_FakeNetworks())
+    service = ContainerService(cleanup_interval=0)
+    service._cfg = dataclasses.replace(
+        service._cfg, preferred_networks=("ctf_net", "bridge_a", "bridge_b")
+    )
+
+    async def _run():
+        result = await service._resolve_network(client)
+        await service.close()
+        return result
+
+    assert asyncio.run(_run()) == "bridge_a"
+    assert sorted(started) == ["bridge_a", "bridge_b", "ctf_net"]
+
+
+def test_latest_active_instance_skips_expired_rows(instance_db):
+
+    async def _run():
+        async with instance_db() as sessions:
+            service = ContainerService(cleanup_interval=0)
+            now = datetime.now(timezone.utc)
+
+            async with sessions() as db:
+                for user_id, offset in ((2, -60), (3, 60)):
+                    instance = ChallengeInstance(challenge_id=1, user_id=user_id)
+                    instance.mark_running(
+                        container_id=f"c{offset}",
+                        connection_info=None,
+                        started_at=now,
+                        expires_at=now + timedelta(seconds=offset),
+                    )
+                    db.add(instance)
+                await db.commit()
+
+                assert await service.get_latest_active_instance(db, challenge_id=1, user_id=2) is None
+                latest = await service.get_latest_active_instance(db, challenge_id=1, user_id=3)
+                assert latest.container_id == "c60"
+                assert await service.get_shared_instance(db, challenge_id=1) is None
+
+    asyncio.run(_run())
+
+
+def test_config_from_env_parses_runner_settings():
+    from app.services.container_service import _config_from_env
+
+    config = _config_from_env(
+        {
+            "CHALLENGE_ACCESS_BASE_URL": "https://ctf.example.com:8443/play/",
+            "CHALLENGE_CONTAINER_NETWORK": "arena",
+            "CHALLENGE_RUNNER": " Remote-Docker ",
+            "CHALLENGE_DOCKER_HOST": "tcp://10.0.0.5:2376",
+            "CHALLENGE_DOCKER_TLS_VERIFY": " Yes ",
+            "CHALLENGE_DOCKER_TLS_CA_CERT": "/certs/ca.pem",
+        }
+    )
+
+    assert config.url_prefix == "https://ctf.example.com:8443/play/"
+    assert (config.base_scheme, config.base_host, config.base_port) == ("https", "ctf.example.com", 8443)
+    assert config.preferred_networks == ("arena", "ctf_net")
+    assert config.runner == "remote-docker"
+    assert config.ttl_seconds == 3600
+    assert config.docker_host == "tcp://10.0.0.5:2376"
+    assert config.tls_verify is True
+    assert config.docker_pool_size == config.docker_workers == 16
+    assert (config.tls_ca_cert, config.tls_cert) == ("/certs/ca.pem", None)
+    # docker-compose passes unset variables through as empty strings.
+    assert _config_from_env({"CHALLENGE_DOCKER_TLS_VERIFY": ""}).tls_verify is False
+
+
+def test_start_instance_resolves_races_on_the_unique_index(monkeypatch, instance_db):
+
+    async def _run():
+        async with instance_db() as sessions:
+            service = ContainerService(ttl_seconds=30, cleanup_interval=0)
+            challenge = _make_challenge()
+            now = datetime.now(timezone.utc)
+            launches = []
+
+            async def _fake_launch(**kwargs):
+                launches.append(kwargs["instance"].id)
+                return LaunchResult(container_id="fresh", connection_info={"host": "localhost", "ports": []})
+
+            removed = []
+
+            async def _fake_stop(container_id, **kwargs):
+                removed.append(container_id)
+
+            monkeypatch.setattr(service, "_launch_container", _fake_launch)
+            monkeypatch.setattr(service, "_stop_container", _fake_stop)
+
+            async with sessions() as db:
+                # A concurrent launch inserted its row after our lookup ran.
+                winner = ChallengeInstance(challenge_id=1, user_id=2)
+                winner.mark_starting()
+                # An expired row for another player that the reaper has not seen.
+                stale = ChallengeInstance(challenge_id=1, user_id=3)
+                stale.mark_running(
+                    container_id="stale",
+                    connection_info=None,
+                    started_at=now,
+                    expires_at=now - timedelta(seconds=5),
+                )
+                # Expired too, but unrelated to this launch: it is left to the reaper.
+                other = ChallengeInstance(challenge_id=2, user_id=3)
+                other.mark_running(
+                    container_id="other",
+                    connection_info=None,
+                    started_at=now,
+                    expires_at=now - timedelta(seconds=5),
+                )
+                db.add_all([winner, stale, other])
+                await db.commit()
+
+                real_lookup = service.get_latest_active_instance
+                lookups = []
+
+                async def _racy_lookup(*args, **kwargs):
+                    lookups.append(kwargs["user_id"])
+                    if len(lookups) == 1:
+                        return None
+                    return await real_lookup(*args, **kwargs)
+
+                monkeypatch.setattr(service, "get_latest_active_instance", _racy_lookup)
+                result = await service.start_instance(db, challenge=challenge, user=_make_user(2))
+                assert result.id == winner.id
+                assert launches == []
+
+                monkeypatch.setattr(service, "get_latest_active_instance", real_lookup)
+                fresh = await service.start_instance(db, challenge=challenge, user=_make_user(3))
+                assert fresh.status == "running"
+                assert launches == [fresh.id]
+                await db.refresh(stale)
+                await db.refresh(other)
+                assert stale.status == "stopped"
+                assert other.status == "running"
+                assert removed == ["stale"]
+
+    asyncio.run(_run())
+
+
+def test_ensure_static_instance_resolves_races_on_the_shared_index(monkeypatch, instance_db):
+
+    async def _run():
+        async with instance_db() as sessions:
+            service = ContainerService(cleanup_interval=0)
+            challenge = _make_challenge(deployment_type=DeploymentType.static_container)
+
+            async def _fake_launch(**kwargs):  # pragma: no cover - should not run
+                raise AssertionError("launch should not be called")
+
+            monkeypatch.setattr(service, "_launch_container", _fake_launch)
+
+            async with sessions() as db:
+                # Another worker reserved the shared instance after our lookup.
+                winner = ChallengeInstance(challenge_id=challenge.id, user_id=None)
+                winner.mark_starting()
+                db.add(winner)
+                await db.commit()
+
+                real_lookup = service.get_shared_instance
+                lookups = []
+
+                async def _racy_lookup(*args, **kwargs):
+                    lookups.append(kwargs["challenge_id"])
+                    if len(lookups) == 1:
+                        return None
+                    return await real_lookup(*args, **kwargs)
+
+                monkeypatch.setattr(service, "get_shared_instance", _racy_lookup)
+                result = await service.ensure_static_instance(db, challenge=challenge)
+                assert result.id == winner.id
+                assert len(lookups) == 2
+
+    asyncio.run(_run())
+
+
+def test_active_instance_cache_rechecks_the_row(monkeypatch, instance_db):
+    from sqlalchemy import update
+
+    async def _run():
+        async with instance_db() as sessions:
+            service = ContainerService(ttl_seconds=30, cleanup_interval=0)
+
+            async def _fake_launch(**kwargs):
+                return LaunchResult(container_id="c1", connection_info={"host": "localhost", "ports": []})
+
+            monkeypatch.setattr(service, "_launch_container", _fake_launch)
+
+            async with sessions() as db:
+                started = await service.start_instance(db, challenge=_make_challenge(), user=_make_user(2))
+            assert service._active_ids == {(1, 2): started.id}
+
+            async with sessions() as db:
+                found = await service.get_latest_active_instance(db, challenge_id=1, user_id=2)
+                assert found.id == started.id
+
+            # Another worker stops the instance behind this process's back.
+            async with sessions() as db:
+                await db.execute(update(ChallengeInstance).values(status="stopped"))
+                await db.commit()
+
+            async with sessions() as db:
+                assert await service.get_latest_active_instance(db, challenge_id=1, user_id=2) is None
+            assert service._active_ids == {}
+
+    asyncio.run(_run())
+
+
+def test_warm_up_resolves_network_once():
+    lookups = []
+
+    class _FakeNetworks:
+        def get(self, name):
+            lookups.append(name)
+            time.sleep(0.01)
+
+    client = SimpleNamespace(networks=_FakeNetworks())
+
+    async def _run():
+        service = ContainerService(cleanup_interval=0, runner="docker")
+
+        async def _fake_get_client():
+            return client
+
+        service._get_client = _fake_get_client
+        await asyncio.gather(service.warm_up(), service._resolve_network(client))
+        assert await service._resolve_network(client) == service._cfg.preferred_networks[0]
+        await service.close()
+
+    asyncio.run(_run())
+    assert len(lookups) == 1
+
+
+def test_player_stop_is_graceful_but_reaping_forces(monkeypatch):
+    stops = []
+
+    async def _run():
+        service = ContainerService(cleanup_interval=0)
+        service._cfg = dataclasses.replace(service._cfg, stop_grace_seconds=3)
+
+        async def _fake_stop(container_id, *, grace=0):
+            stops.append((container_id, grace))
+
+        monkeypatch.setattr(service, "_stop_container", _fake_stop)
+
+        instance = ChallengeInstance(challenge_id=1, user_id=2)
+        instance.mark_running(
+            container_id="mine",
+            connection_info=None,
+            started_at=datetime.now(timezone.utc),
+            expires_at=None,
+        )
+        await service.stop_instance(_FakeSession(), instance=instance)
+        await service.reap_expired_instances(_FakeSession(instances=["expired"]))
+
+    asyncio.run(_run())
+    assert stops == [("mine", 3), ("expired", 0)]
+
+
+def test_reap_drains_expired_rows_in_batches(monkeypatch, instance_db):
+    from sqlalchemy import select
+
+    from app.services import container_service
+
+    monkeypatch.setattr(container_service, "_REAP_BATCH_SIZE", 2)
+
+    async def _run():
+        async with instance_db() as sessions:
+            service = ContainerService(cleanup_interval=0)
+            removed = []
+
+            async def _fake_stop(container_id, **kwargs):
+                removed.append(container_id)
+
+            monkeypatch.setattr(service, "_stop_container", _fake_stop)
+            now = datetime.now(timezone.utc)
+
+            async with sessions() as db:
+                for user_id, offset in enumerate((-50, -40, -30, -20, -10, 60)):
+                    instance = ChallengeInstance(challenge_id=1, user_id=user_id)
+                    instance.mark_running(
+                        container_id=f"c{offset}",
+                        connection_info=None,
+                        started_at=now,
+                        expires_at=now + timedelta(seconds=offset),
+                    )
+                    db.add(instance)
+                await db.commit()
+
+                assert await service.reap_expired_instances(db) == 5
+                statuses = (await db.execute(select(ChallengeInstance.status))).scalars().all()
+        return removed, statuses
+
+    removed, statuses = asyncio.run(_run())
+    assert removed == ["c-50", "c-40", "c-30", "c-20", "c-10"]
+    assert sorted(statuses) == ["running"] + ["stopped"] * 5
+
+
+def test_cleanup_ticks_are_fixed_rate_and_skip_overruns():
+    from app.services.container_service import _next_tick
+
+    # A quick sweep keeps the original grid instead of drifting by its runtime.
+    assert _next_tick(100.0, 102.5, 60.0) == 160.0
+    # A sweep that overran two intervals resumes on the grid, once.
+    assert _next_tick(100.0, 245.0, 60.0) == 280.0
+
+
+def test_deployment_type_of_coerces_stored_values():
+    from app.models.challenge import DeploymentType, deployment_type_of
+
+    assert deployment_type_of(SimpleNamespace(deployment_type="static_container")) is (
+        DeploymentType.static_container
+    )
+    assert deployment_type_of(SimpleNamespace(deployment_type="bogus")) is (
+        DeploymentType.dynamic_container
+    )
+    assert deployment_type_of(SimpleNamespace()) is DeploymentType.dynamic_container
+
+
+def test_load_expiries_seeds_heap_from_active_rows(instance_db):
+
+    async def _run():
+        async with instance_db() as sessions:
+            service = ContainerService(cleanup_interval=0)
+            now = datetime.now(timezone.utc)
+
+            async with sessions() as db:
+                later = ChallengeInstance(challenge_id=1, user_id=2)
+                later.mark_running(
+                    container_id="a",
+                    connection_info=None,
+                    started_at=now,
+                    expires_at=now + timedelta(seconds=120),
+                )
+                sooner = ChallengeInstance(challenge_id=1, user_id=3)
+                sooner.mark_running(
+                    container_id="b",
+                    connection_info=None,
+                    started_at=now,
+                    expires_at=now + timedelta(seconds=60),
+                )
+                shared = ChallengeInstance(challenge_id=2, user_id=None)
+                shared.mark_running(
+                    container_id="c",
+                    connection_info=None,
+                    started_at=now,
+                    expires_at=None,
+                )
+                stopped = ChallengeInstance(challenge_id=3, user_id=2)
+                stopped.mark_stopped()
+                db.add_all([later, sooner, shared, stopped])
+                await db.commit()
+
+                await service._load_expiries(db)
+
+        assert [instance_id for _, instance_id in sorted(service._expiry_heap)] == [sooner.id, later.id]
+        assert abs(service._expiry_heap[0][0] - (now.timestamp() + 60)) < 1
+
     asyncio.run(_run())
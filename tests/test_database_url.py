@@ -96,3 +96,28 @@ def test_railway_env_adds_ssl_flag():
 def test_railway_env_missing_bits_returns_none():
     env = {"PGHOST": "railway"}
     assert _railway_env_database_url(env) is None
+
+
+def test_engine_json_serializer_round_trips_columns():
+    import asyncio
+
+    from app.database import _build_engine
+    from app.models.challenge_instance import ChallengeInstance
+    from sqlalchemy import insert, select
+
+    async def _run():
+        engine = _build_engine("sqlite+aiosqlite:///:memory:")
+        info = {"host": "localhost", "ports": [{"container_port": "80/tcp", "host_port": "49153"}]}
+        async with engine.begin() as conn:
+            await conn.run_sync(ChallengeInstance.__table__.create)
+            await conn.execute(
+                insert(ChallengeInstance.__table__).values(challenge_id=1, connection_info=info)
+            )
+            stored = await conn.scalar(select(ChallengeInstance.__table__.c.connection_info))
+        await engine.dispose()
+        return stored
+
+    assert asyncio.run(_run()) == {
+        "host": "localhost",
+        "ports": [{"container_port": "80/tcp", "host_port": "49153"}],
+    }
@@ -185,3 +185,32 @@ async def _run_duplicate_username_registration():
 
 def test_register_rejects_duplicate_username():
     asyncio.run(_run_duplicate_username_registration())
+
+
+def test_constant_time_equals_hex_compares_raw_digests():
+    from app.security_tokens import constant_time_equals_hex, hash_token, token_digest
+
+    digest = token_digest("reset-token")
+    assert constant_time_equals_hex(hash_token("reset-token"), digest)
+    assert not constant_time_equals_hex(hash_token("other-token"), digest)
+    assert not constant_time_equals_hex(None, digest)
+    assert not constant_time_equals_hex("not-hex", digest)
+
+
+def test_generate_reset_tokens_returns_distinct_urlsafe_tokens():
+    import base64
+    import string
+
+    from app.security_tokens import generate_reset_token, generate_reset_tokens
+
+    tokens = generate_reset_tokens(16)
+    alphabet = set(string.ascii_letters + string.digits + "-_")
+
+    assert len(tokens) == 16
+    assert len(set(tokens)) == 16
+    for token in tokens:
+        # Same shape as a single token: 32 bytes, urlsafe, no padding.
+        assert len(token) == len(generate_reset_token()) == 43
+        assert set(token) <= alphabet
+        assert len(base64.urlsafe_b64decode(token + "=")) == 32
+    assert generate_reset_tokens(0) == []
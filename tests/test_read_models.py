@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app import schemas  # noqa: E402
+from app.models.challenge import DeploymentType  # noqa: E402
+
+
+def _challenge_row(**overrides):
+    values = dict(
+        id=3,
+        title="Warmup",
+        description="",
+        category_id=1,
+        points=100,
+        difficulty="easy",
+        created_at=None,
+        competition_id=None,
+        unlocked_by_id=None,
+        is_active=True,
+        is_private=False,
+        deployment_type=DeploymentType.static_container,
+        always_on=False,
+        tags=["web"],
+        hints=[SimpleNamespace(id=1, text="look closer", penalty=5, order_index=0)],
+        attachments=[],
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_from_orm_trusted_builds_nested_models_without_validation(monkeypatch):
+    monkeypatch.setattr(schemas, "TRUSTED_DB", True)
+
+    result = schemas.ChallengePublic.from_orm_trusted(_challenge_row())
+
+    assert result.title == "Warmup"
+    assert result.solves_count == 0
+    assert isinstance(result.hints[0], schemas.HintRead)
+    assert result.hints[0].text == "look closer"
+
+
+def test_from_orm_trusted_validates_when_disabled(monkeypatch):
+    monkeypatch.setattr(schemas, "TRUSTED_DB", False)
+
+    result = schemas.CategoryRead.from_orm_trusted(SimpleNamespace(id="7", name="Web"))
+
+    assert result.id == 7
+
+
+def test_instance_connection_info_is_typed(monkeypatch):
+    row = SimpleNamespace(
+        id=4,
+        status="running",
+        connection_info={
+            "host": "localhost",
+            "ports": [{"host": "0.0.0.0", "host_port": "55492", "container_port": "8000/tcp"}],
+        },
+    )
+
+    for trusted in (False, True):
+        monkeypatch.setattr(schemas, "TRUSTED_DB", trusted)
+        result = schemas.ChallengeInstanceRead.from_orm_trusted(row)
+
+        assert isinstance(result.connection_info, schemas.ConnectionInfo)
+        assert result.connection_info.ports[0].host_port == "55492"
+        assert result.model_dump()["connection_info"]["ports"][0]["container_port"] == "8000/tcp"
+
+
+def test_instance_connection_info_round_trips_undeclared_keys(monkeypatch):
+    stored = {
+        "host": "localhost",
+        "ports": [{"host": "localhost", "port": 31337, "protocol": "tcp"}],
+        "proxy": "edge-1",
+    }
+    row = SimpleNamespace(id=5, status="running", connection_info=stored)
+
+    for trusted in (False, True):
+        monkeypatch.setattr(schemas, "TRUSTED_DB", trusted)
+        result = schemas.ChallengeInstanceRead.from_orm_trusted(row)
+
+        assert result.model_dump(exclude_unset=True)["connection_info"] == stored
+        assert result.connection_info.ports[0].model_dump(exclude_unset=True)["port"] == 31337
+
+
+def test_challenge_list_adapter_matches_model_serialisation(monkeypatch):
+    import json
+
+    monkeypatch.setattr(schemas, "TRUSTED_DB", True)
+    challenge = schemas.ChallengePublic.from_orm_trusted(_challenge_row())
+
+    payload = json.loads(schemas.CHALLENGE_LIST_ADAPTER.dump_json([challenge]))
+
+    assert payload == [challenge.model_dump(mode="json")]
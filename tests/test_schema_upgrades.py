@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -130,3 +131,168 @@ async def test_upgrades_make_challenge_instance_user_nullable():
         stored = await conn.execute(text("SELECT id, user_id FROM challenge_instances"))
         assert stored.mappings().all() == [{"id": 10, "user_id": 5}]
     await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_concurrent_upgrades_apply_every_step(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    async with engine.begin() as conn:
+        await _create_legacy_schema(conn)
+
+    await schema_upgrades.run_post_creation_upgrades_concurrently(engine)
+    # A second pass must be a no-op against an already upgraded schema.
+    await schema_upgrades.run_post_creation_upgrades_concurrently(engine)
+
+    async with engine.connect() as conn:
+        columns = (await conn.exec_driver_sql("PRAGMA table_info('users')")).all()
+        assert {"display_name", "bio"}.issubset({row[1] for row in columns})
+        columns = (await conn.exec_driver_sql("PRAGMA table_info('hints')")).all()
+        assert "order_index" in {row[1] for row in columns}
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_upgraded_instance_indexes_match_the_model():
+    from app.models.challenge_instance import ChallengeInstance
+
+    declared = {
+        index.name: str(index.dialect_options["sqlite"]["where"])
+        for index in ChallengeInstance.__table__.indexes
+    }
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await _create_legacy_schema(conn)
+        await schema_upgrades.run_post_creation_upgrades(conn)
+        rows = await conn.execute(
+            text("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'challenge_instances'")
+        )
+        upgraded = {name: sql.split(" WHERE ", 1)[1] for name, sql in rows if sql}
+    await engine.dispose()
+
+    assert upgraded == declared
+
+
+class _PgError(Exception):
+    def __init__(self, message, sqlstate):
+        super().__init__(message)
+        self.sqlstate = sqlstate
+
+
+def test_already_exists_prefers_sqlstate_over_message():
+    duplicate = DBAPIError("ALTER TABLE", None, _PgError("boom", "42701"))
+    assert schema_upgrades._is_already_exists(duplicate)
+
+    # A real failure is not swallowed just because the text looks familiar.
+    other = DBAPIError("ALTER TABLE", None, _PgError("relation already exists", "42501"))
+    assert not schema_upgrades._is_already_exists(other)
+
+    sqlite_error = DBAPIError("ALTER TABLE", None, Exception("duplicate column name: bio"))
+    assert schema_upgrades._is_already_exists(sqlite_error)
+
+
+@pytest.mark.anyio
+async def test_upgrades_collapse_duplicate_active_instances():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await _create_legacy_schema(conn)
+        for instance_id in (1, 2):
+            await conn.execute(
+                text(
+                    "INSERT INTO challenge_instances "
+                    "(id, challenge_id, user_id, status, container_id, created_at, updated_at) "
+                    "VALUES (:id, 1, 5, 'running', :container, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                ),
+                {"id": instance_id, "container": f"c{instance_id}"},
+            )
+
+        await schema_upgrades.run_post_creation_upgrades(conn)
+
+        stored = await conn.execute(text("SELECT id, status FROM challenge_instances ORDER BY id"))
+        assert stored.all() == [(1, "stopping"), (2, "running")]
+        indexes = (await conn.exec_driver_sql("PRAGMA index_list('challenge_instances')")).all()
+        assert any(row[1] == "uq_challenge_instances_active_user" and row[2] for row in indexes)
+        assert any(row[1] == "uq_challenge_instances_active_shared" and row[2] for row in indexes)
+        names = {row[1] for row in indexes}
+        assert "ix_challenge_instances_active_expiry" in names
+        assert "ix_challenge_instances_active_recent" in names
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_upgrades_collapse_duplicate_shared_instances(monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.services.container_service import ContainerService
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await _create_legacy_schema(conn)
+        await schema_upgrades.run_post_creation_upgrades(conn)
+        # Simulate a database from before the shared index existed.
+        await conn.execute(text("DROP INDEX uq_challenge_instances_active_shared"))
+        for instance_id in (1, 2):
+            await conn.execute(
+                text(
+                    "INSERT INTO challenge_instances "
+                    "(id, challenge_id, user_id, status, container_id, created_at, updated_at) "
+                    "VALUES (:id, 1, NULL, 'running', :container, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                ),
+                {"id": instance_id, "container": f"s{instance_id}"},
+            )
+
+        await schema_upgrades.ensure_instance_shared_unique_index(conn, "sqlite")
+
+        stored = await conn.execute(text("SELECT id, status FROM challenge_instances ORDER BY id"))
+        assert stored.all() == [(1, "stopping"), (2, "running")]
+        indexes = (await conn.exec_driver_sql("PRAGMA index_list('challenge_instances')")).all()
+        assert any(row[1] == "uq_challenge_instances_active_shared" and row[2] for row in indexes)
+
+    service = ContainerService(cleanup_interval=0)
+    removed = []
+
+    async def _fake_stop(container_id, **kwargs):
+        removed.append(container_id)
+
+    monkeypatch.setattr(service, "_stop_container", _fake_stop)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        assert await service.remove_stopping_instances(db) == 1
+    await engine.dispose()
+
+    assert removed == ["s1"]
+
+
+@pytest.mark.anyio
+async def test_retired_duplicate_containers_are_removed_by_cleanup(monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.services.container_service import ContainerService
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await _create_legacy_schema(conn)
+        for instance_id in (1, 2):
+            await conn.execute(
+                text(
+                    "INSERT INTO challenge_instances "
+                    "(id, challenge_id, user_id, status, container_id, created_at, updated_at) "
+                    "VALUES (:id, 1, 5, 'running', :container, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                ),
+                {"id": instance_id, "container": f"c{instance_id}"},
+            )
+        await schema_upgrades.run_post_creation_upgrades(conn)
+
+    service = ContainerService(cleanup_interval=0)
+    removed = []
+
+    async def _fake_stop(container_id, **kwargs):
+        removed.append(container_id)
+
+    monkeypatch.setattr(service, "_stop_container", _fake_stop)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        assert await service.remove_stopping_instances(db) == 1
+        stored = await db.execute(text("SELECT id, status FROM challenge_instances ORDER BY id"))
+        assert stored.all() == [(1, "stopped"), (2, "running")]
+    await engine.dispose()
+
+    # Only the losing row's container is removed; the survivor keeps running.
+    assert removed == ["c1"]